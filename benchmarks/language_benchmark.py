@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark deteksi bahasa otomatis (OCR_LANGUAGE=auto) vs `-l ind+eng`
+
+Mengukur per gambar:
+1. OCR penuh dengan ind+eng (perilaku lama)
+2. Deteksi bahasa (sampel + OCR eng) ditambah OCR penuh dengan language terpilih
+
+Keluar dengan exit code 1 jika total mode auto lebih lambat dari ind+eng,
+artinya deteksi tidak memberi speedup bersih pada dataset ini.
+
+Usage:
+    python benchmarks/language_benchmark.py [folder] [--psm N] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+def timed(function, *args):
+    """(hasil, detik) dari satu pemanggilan"""
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def measure_image(image_path: str, psm_mode: int, available, runs: int) -> dict:
+    """Median waktu ind+eng vs deteksi + OCR untuk satu gambar"""
+    from models.language import DEFAULT_LANGUAGES, detect_language, fallback_languages
+    from models.ocr_model import run_tesseract
+
+    baseline_languages = fallback_languages(available) or DEFAULT_LANGUAGES
+    baseline, detect, ocr = [], [], []
+    language = baseline_languages
+    for _ in range(runs):
+        baseline.append(timed(run_tesseract, image_path, psm_mode, baseline_languages, 1)[1])
+        detection, seconds = timed(detect_language, image_path, available)
+        language = detection['language']
+        detect.append(seconds)
+        ocr.append(timed(run_tesseract, image_path, psm_mode, language, 1)[1])
+
+    return {
+        'image': os.path.basename(image_path),
+        'language': language,
+        'baseline_s': statistics.median(baseline),
+        'detect_s': statistics.median(detect),
+        'ocr_s': statistics.median(ocr)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark deteksi bahasa vs ind+eng")
+    parser.add_argument('directory', nargs='?', default=os.path.join(ROOT_DIR, 'gambar'))
+    parser.add_argument('--psm', type=int, default=6)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    from models.ocr_model import find_image_files, probe_tesseract
+
+    probe = probe_tesseract()
+    if not probe['available']:
+        print("❌ Tesseract tidak ditemukan")
+        return 1
+
+    image_files = find_image_files(args.directory)
+    if not image_files:
+        print(f"❌ Tidak ada gambar di folder '{args.directory}'")
+        return 1
+
+    rows = [measure_image(path, args.psm, probe['languages'], args.runs) for path in image_files]
+
+    print(f"{'gambar':<28}{'language':>10}{'ind+eng':>10}{'deteksi':>10}{'ocr':>10}{'auto':>10}")
+    for row in rows:
+        auto = row['detect_s'] + row['ocr_s']
+        print(f"{row['image']:<28}{row['language']:>10}{row['baseline_s']:>10.3f}"
+              f"{row['detect_s']:>10.3f}{row['ocr_s']:>10.3f}{auto:>10.3f}")
+
+    baseline_total = sum(row['baseline_s'] for row in rows)
+    auto_total = sum(row['detect_s'] + row['ocr_s'] for row in rows)
+    gain = (baseline_total - auto_total) / baseline_total * 100 if baseline_total else 0.0
+    status = "✅" if auto_total <= baseline_total else "❌"
+    print(f"\n{status} Total ind+eng {baseline_total:.3f}s vs auto {auto_total:.3f}s ({gain:+.1f}%)")
+    return 0 if auto_total <= baseline_total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
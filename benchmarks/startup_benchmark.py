@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark untuk main.py dan entry point library
+
+Mengukur:
+1. Wall time `python main.py help` (cold start proses baru)
+2. Waktu import `main` di proses baru (python -X importtime)
+3. Biaya get_controller() pertama vs berikutnya (reuse controller)
+
+Keluar dengan exit code 1 jika salah satu pengukuran melewati budget.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs N] [--help-budget-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Target budget default (milidetik)
+HELP_BUDGET_MS = 150.0
+IMPORT_BUDGET_MS = 50.0
+CONTROLLER_REUSE_BUDGET_MS = 1.0
+
+
+def measure_help(runs: int) -> float:
+    """Median wall time `python main.py help` dalam milidetik"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT_DIR, 'main.py'), 'help'],
+                       capture_output=True, cwd=ROOT_DIR)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure_import(runs: int) -> float:
+    """Median waktu import kumulatif modul `main` dalam milidetik"""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                                capture_output=True, text=True, cwd=ROOT_DIR)
+        for line in result.stderr.splitlines():
+            # Format: "import time: self [us] | cumulative | imported package"
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == 'main':
+                timings.append(int(parts[1]) / 1000)
+                break
+    return statistics.median(timings) if timings else float('nan')
+
+
+def measure_controller_reuse() -> tuple:
+    """Waktu get_controller() pertama dan berikutnya dalam milidetik"""
+    import main
+
+    start = time.perf_counter()
+    main.get_controller('benchmark-dummy-key')
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    main.get_controller('benchmark-dummy-key')
+    reuse_ms = (time.perf_counter() - start) * 1000
+
+    return first_ms, reuse_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark OCR pipeline")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--help-budget-ms', type=float, default=HELP_BUDGET_MS)
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    help_ms = measure_help(args.runs)
+    import_ms = measure_import(args.runs)
+
+    checks = [
+        ("main.py help", help_ms, args.help_budget_ms),
+        ("import main", import_ms, args.import_budget_ms),
+    ]
+
+    print("⏱️ STARTUP BENCHMARK")
+    print("=" * 60)
+
+    try:
+        first_ms, reuse_ms = measure_controller_reuse()
+        print(f"   get_controller() pertama: {first_ms:8.2f} ms (info)")
+        checks.append(("get_controller() reuse", reuse_ms, CONTROLLER_REUSE_BUDGET_MS))
+    except Exception as e:
+        print(f"⚠️ Controller benchmark dilewati: {e}")
+
+    failed = False
+    for name, value, budget in checks:
+        ok = value <= budget
+        failed = failed or not ok
+        marker = "✅" if ok else "❌"
+        print(f"{marker} {name:<25} {value:8.2f} ms (budget {budget:.1f} ms)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
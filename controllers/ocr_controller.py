@@ -5,20 +5,43 @@ Menangani workflow dan koordinasi antara Model dan View
 """
 
 import os
-from typing import Dict, List, Optional
-from models.ocr_model import OCRModel
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from models.form_templates import format_fields, load_form_template
+from models.hedging import DeadlineExceeded, remaining_seconds
+from models.language import detect_language, fallback_languages, folder_language
+from models.ocr_model import AUTO_DETECT_PSM_MODES, OCRModel, post_process_text
+from models.ocr_result import OCRResult
+from models.scheduler import PriorityScheduler
+from models.speculative import SpeculativeCache, check_cancelled
 from views.ocr_view import OCRView
 
+# PSM yang direkomendasikan di menu interaktif
+RECOMMENDED_PSM = 6
+
 
 class OCRController:
     """Controller untuk mengatur alur kerja OCR aplikasi"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize OCR Controller dengan Model dan View"""
+    def __init__(self, api_key: Optional[str] = None, scheduler: Optional[PriorityScheduler] = None):
+        """
+        Initialize OCR Controller dengan Model dan View
+        
+        Args:
+            api_key: Optional API key override
+            scheduler: Scheduler slot Tesseract/Gemini yang dibagi antar request
+        """
         try:
             self.model = OCRModel(api_key)
             self.view = OCRView()
             self.psm_info = self.model.get_psm_info()
+            self.scheduler = scheduler or PriorityScheduler()
+            self.profiler = None
+            self.speculation = None
+            self.last_batch_usage = self._empty_usage_totals()
         except Exception as e:
             self.view = OCRView()
             self.view.show_error(str(e), "Pastikan file .env berisi GEMINI_API_KEY yang valid")
@@ -37,17 +60,21 @@ class OCRController:
             else:
                 self.view.show_tesseract_check(True)
             
-            # Get image path
-            image_path = self._get_image_path()
+            # Get image path (OCR spekulatif berjalan selama menu ditampilkan)
+            image_files = self.model.find_image_files()
+            self._start_speculation(image_files)
+            image_path = self._get_image_path(image_files)
             if not image_path:
                 self.view.show_error("Tidak ada gambar yang dipilih")
                 return
             
-            # Choose PSM mode
+            # Choose PSM mode (probing PSM gambar terpilih berjalan di background)
+            self._speculate_selection(image_path)
             psm_mode = self._choose_psm_mode(image_path)
             if psm_mode is None:
                 self.view.show_error("PSM mode tidak dipilih")
                 return
+            self._narrow_speculation(image_path, psm_mode)
             
             # Process image
             result = self._process_image(image_path, psm_mode)
@@ -61,11 +88,14 @@ class OCRController:
             self.view.show_error("Dibatalkan oleh user")
         except Exception as e:
             self.view.show_error(f"Unexpected error: {e}")
+        finally:
+            self._stop_speculation()
     
-    def _get_image_path(self) -> Optional[str]:
+    def _get_image_path(self, image_files: Optional[List[str]] = None) -> Optional[str]:
         """Get image path from user selection"""
         # Find available images
-        image_files = self.model.find_image_files()
+        if image_files is None:
+            image_files = self.model.find_image_files()
         
         # Show selection menu
         choice = self.view.show_image_selection_menu(image_files)
@@ -91,7 +121,7 @@ class OCRController:
     def _choose_psm_mode(self, image_path: str) -> Optional[int]:
         """Choose PSM mode with optional auto-detection"""
         # Get initial recommendation (could be from previous analysis)
-        recommended_psm = 6  # Default recommendation
+        recommended_psm = RECOMMENDED_PSM  # Default recommendation
         
         # Show PSM selection menu
         choice = self.view.show_psm_selection_menu(self.psm_info, recommended_psm)
@@ -106,8 +136,11 @@ class OCRController:
         """Perform auto PSM detection"""
         self.view.show_info("Melakukan auto-detection PSM mode...", "🔍")
         
-        # Get auto-detection results
-        auto_result = self.model.auto_detect_psm(image_path)
+        # Get auto-detection results (memakai hasil probing spekulatif jika ada)
+        language = self._resolve_language(image_path)
+        auto_result = self.model.auto_detect_psm(
+            image_path, lambda psm: self._extract_text(image_path, psm, language)
+        )
         
         if not auto_result['test_results']:
             self.view.show_error("Auto-detection gagal")
@@ -126,14 +159,33 @@ class OCRController:
             # User declined, show selection menu again
             return self.view.show_psm_selection_menu(self.psm_info, recommended_psm)
     
-    def _process_image(self, image_path: str, psm_mode: int) -> Optional[Dict]:
-        """Process image with selected PSM mode"""
+    def _process_image(self, image_path: str, psm_mode: int, priority: str = 'interactive',
+                       job_id: Optional[str] = None, deadline: Optional[float] = None,
+                       form_template: Optional[str] = None, language: Optional[str] = None) -> Optional[OCRResult]:
+        """
+        Process image with selected PSM mode
+        
+        Deadline (time.monotonic()) dicek sebelum dan sesudah menunggu setiap slot
+        Tesseract; jika sudah lewat, gambar gagal (None) tanpa menjalankan OCR.
+        Untuk koreksi Gemini deadline mempersempit timeout HTTP; jika terlewati,
+        teks original dipakai tanpa menunggu slot atau timeout penuh. Proses
+        tesseract yang sudah berjalan tidak diinterupsi. Jika form_template
+        diberikan, hanya region field dari template yang di-OCR. Language pack
+        dipilih lewat _resolve_language() dan dicatat di result. Hasil OCR dan
+        koreksi spekulatif (mode interaktif) dipakai jika cocok.
+        """
         try:
+            if form_template:
+                return self._process_form(image_path, psm_mode, form_template, priority, job_id,
+                                          deadline, language)
+            
             image_name = os.path.basename(image_path)
             
-            # Step 1: Extract text with Tesseract
+            # Step 1: Extract text with Tesseract (language pack minimal untuk gambar ini)
             self.view.show_processing_status("tesseract", image_name)
-            raw_text = self.model.extract_text_tesseract(image_path, psm_mode)
+            language = self._resolve_language(image_path, language, priority=priority, job_id=job_id,
+                                              deadline=deadline)
+            raw_text = self._extract_text(image_path, psm_mode, language, priority, job_id, deadline)
             
             if not raw_text:
                 self.view.show_warning("Tidak ada teks yang terdeteksi dari gambar")
@@ -141,50 +193,254 @@ class OCRController:
             
             # Step 2: Correct typos with Gemini
             self.view.show_processing_status("correction", image_name)
-            correction_result = self.model.correct_typo_with_gemini(raw_text)
+            correction_result = self._speculative(('gemini', image_path, psm_mode, language))
+            if correction_result is None:
+                with self._gemini_slot(priority, job_id, deadline), self._stage('correct_typo_with_gemini'):
+                    correction_result = self.model.correct_typo_with_gemini(raw_text, deadline=deadline)
             
-            # Step 3: Post-process text
+            # Step 3: Bangun result
+            # Result menyimpan teks mentah + edit; corrected_text dan final_text
+            # (post-processed) diturunkan saat diakses, bukan di stage ini
             self.view.show_processing_status("postprocess", image_name)
-            final_text = self.model.post_process_text(correction_result['corrected_text'])
-            
-            # Prepare result
-            result = {
-                'image_path': image_path,
-                'image_name': image_name,
-                'psm_mode': psm_mode,
-                'psm_description': self.psm_info[psm_mode]['name'],
-                'raw_text': raw_text,
-                'corrected_text': correction_result['corrected_text'],
-                'final_text': final_text,
-                'corrections': correction_result['corrections'],
-                'confidence': correction_result['confidence'],
-                'method': correction_result['method'],
-                'statistics': {
-                    'raw_words': len(raw_text.split()) if raw_text else 0,
-                    'final_words': len(final_text.split()) if final_text else 0,
-                    'corrections_count': len(correction_result['corrections'])
-                }
-            }
-            
-            # Add warning if API failed
-            if not correction_result['success']:
-                result['warning'] = 'Gemini API tidak tersedia, menggunakan teks original'
+            with self._stage('build_result'):
+                result = OCRResult.from_correction(
+                    image_path, image_name, psm_mode, self.psm_info[psm_mode]['name'],
+                    raw_text, correction_result, language
+                )
             
             return result
             
+        except DeadlineExceeded:
+            self.view.show_error(f"Deadline terlewati sebelum OCR selesai: {os.path.basename(image_path)}")
+            return None
         except Exception as e:
             self.view.show_error(f"Error saat processing: {e}")
             return None
     
-    def _handle_results(self, result: Dict):
+    def _process_form(self, image_path: str, psm_mode: int, form_template: str, priority: str,
+                      job_id: Optional[str], deadline: Optional[float],
+                      language: Optional[str] = None) -> OCRResult:
+        """
+        Process form dengan layout yang diketahui: OCR per field region, lalu
+        koreksi Gemini hanya untuk field tanpa skip_correction
+        
+        Hasil berisi 'fields' (map field -> nilai final) dan 'form_template'.
+        Tanpa language eksplisit/template/folder/env, field di-OCR dengan
+        DEFAULT_LANGUAGES yang terinstall (tanpa deteksi halaman penuh).
+        """
+        template = load_form_template(form_template)
+        image_name = os.path.basename(image_path)
+        
+        # Step 1: OCR crop setiap field di dalam satu slot Tesseract
+        self.view.show_processing_status("tesseract", image_name)
+        language = self._configured_language(image_path, language, template)
+        if language == 'auto':
+            # Deteksi dari sampel halaman penuh menghapus keuntungan OCR crop saja
+            language = fallback_languages(self.model.get_tesseract_info()['languages'])
+        with self._tesseract_slot(priority, job_id, deadline), self._stage('extract_fields_tesseract'):
+            raw_fields = self.model.extract_fields_tesseract(image_path, template, language)
+        
+        # Step 2: Koreksi field yang tidak ditandai skip_correction
+        to_correct = {
+            field['name']: raw_fields[field['name']]
+            for field in template['fields']
+            if not field['skip_correction'] and raw_fields[field['name']]
+        }
+        corrected_fields = dict(raw_fields)
+        correction = {'success': True, 'corrections': [], 'confidence': 0,
+                      'method': 'Tanpa koreksi (skip_correction)', 'usage': None}
+        
+        if to_correct:
+            self.view.show_processing_status("correction", image_name)
+            with self._gemini_slot(priority, job_id, deadline), self._stage('correct_fields_with_gemini'):
+                correction = self.model.correct_fields_with_gemini(to_correct, deadline=deadline)
+            corrected_fields.update(correction['fields'])
+        
+        # Step 3: Post-process nilai field dan bangun result
+        self.view.show_processing_status("postprocess", image_name)
+        with self._stage('build_result'):
+            result = OCRResult.from_correction(
+                image_path, image_name, psm_mode, f"Template form {template['name']} (PSM per field)",
+                format_fields(raw_fields), {
+                    'success': correction['success'],
+                    'corrected_text': format_fields(corrected_fields),
+                    'corrections': correction['corrections'],
+                    'edits': [],
+                    'confidence': correction['confidence'],
+                    'method': correction['method'],
+                    'usage': correction['usage']
+                }, language
+            )
+            result['form_template'] = template['name']
+            result['fields'] = {name: post_process_text(value) for name, value in corrected_fields.items()}
+        
+        return result
+    
+    def _resolve_language(self, image_path: str, language: Optional[str] = None,
+                          form_template: Optional[Dict] = None, priority: str = 'interactive',
+                          job_id: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """
+        Pilih language pack Tesseract untuk satu gambar
+        
+        Urutan: parameter eksplisit, language di template form, file .ocr.json di
+        folder gambar, OCR_LANGUAGE, lalu deteksi otomatis ('auto', default)
+        dari sampel beresolusi rendah. Deteksi memakai slot Tesseract sendiri
+        dan hasilnya dibagi dengan kerja spekulatif untuk gambar yang sama.
+        """
+        language = self._configured_language(image_path, language, form_template)
+        if language != 'auto':
+            return language
+        
+        detected = self._speculative(('language', image_path))
+        if detected is None:
+            detected = self._detect_language(image_path, priority, job_id, deadline)
+            if self.speculation:
+                self.speculation.put(('language', image_path), detected)
+        return detected
+    
+    @staticmethod
+    def _configured_language(image_path: str, language: Optional[str] = None,
+                             form_template: Optional[Dict] = None) -> str:
+        """Language dari parameter/template/folder/env, 'auto' jika harus dideteksi"""
+        return (
+            language
+            or (form_template or {}).get('language')
+            or folder_language(os.path.dirname(image_path))
+            or os.getenv('OCR_LANGUAGE', 'auto')
+        )
+    
+    def _detect_language(self, image_path: str, priority: str = 'interactive',
+                         job_id: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """Deteksi language pack dari sampel gambar (satu slot Tesseract)"""
+        with self._tesseract_slot(priority, job_id, deadline), self._stage('detect_language'):
+            detection = detect_language(image_path, self.model.get_tesseract_info()['languages'],
+                                        self.profiler)
+        return detection['language']
+    
+    def _extract_text(self, image_path: str, psm_mode: int, language: str,
+                      priority: str = 'interactive', job_id: Optional[str] = None,
+                      deadline: Optional[float] = None) -> str:
+        """OCR satu gambar, memakai hasil spekulatif untuk (gambar, PSM, language) jika ada"""
+        key = ('tesseract', image_path, psm_mode, language)
+        text = self._speculative(key)
+        if text is None:
+            with self._tesseract_slot(priority, job_id, deadline), self._stage('extract_text_tesseract'):
+                text = self.model.extract_text_tesseract(image_path, psm_mode, language)
+            if self.speculation:
+                self.speculation.put(key, text)
+        return text
+    
+    # ==================== SPECULATIVE OCR (MODE INTERAKTIF) ====================
+    
+    def _start_speculation(self, image_files: List[str]):
+        """
+        Mulai OCR spekulatif (prioritas background) selama menu gambar ditampilkan
+        
+        Gambar paling baru dianggap paling mungkin dipilih: OCR_SPECULATIVE_IMAGES
+        gambar teratas (default 3, 0 = nonaktif) dideteksi language-nya lalu
+        di-OCR dengan PSM rekomendasi.
+        """
+        limit = int(os.getenv('OCR_SPECULATIVE_IMAGES', '3'))
+        if limit <= 0 or not image_files:
+            return
+        
+        self.speculation = self._new_speculation()
+        likely = sorted(image_files, key=os.path.getmtime, reverse=True)[:limit]
+        for image_path in likely:
+            self.speculation.submit(('language', image_path), self._speculate_image, image_path)
+    
+    def _speculate_image(self, image_path: str) -> str:
+        """Task spekulatif per gambar: language lalu OCR dengan PSM rekomendasi"""
+        language = self._configured_language(image_path)
+        if language == 'auto':
+            language = self._detect_language(image_path, 'background')
+        self._speculate_ocr(image_path, (RECOMMENDED_PSM,), language)
+        return language
+    
+    def _speculate_selection(self, image_path: str):
+        """
+        Gambar sudah dipilih: batalkan kerja untuk gambar lain, lalu probing semua
+        PSM auto-detect dan (OCR_SPECULATIVE_GEMINI, default 1) koreksi Gemini
+        untuk PSM rekomendasi selama menu PSM ditampilkan
+        """
+        if self.speculation is None:
+            # Gambar di luar daftar (input manual) tetap di-probe selama menu PSM
+            if int(os.getenv('OCR_SPECULATIVE_IMAGES', '3')) <= 0:
+                return
+            self.speculation = self._new_speculation()
+        
+        self.speculation.cancel(keep=lambda key: key[1] == image_path)
+        self.speculation.submit(('probe', image_path), self._speculate_probe, image_path)
+    
+    def _speculate_probe(self, image_path: str):
+        """Task spekulatif: OCR gambar terpilih untuk semua PSM auto-detect + koreksi Gemini"""
+        language = self._resolve_language(image_path, priority='background')
+        # PSM rekomendasi dan koreksinya dulu (pilihan paling mungkin), baru PSM lain
+        self._speculate_ocr(image_path, (RECOMMENDED_PSM,), language)
+        if os.getenv('OCR_SPECULATIVE_GEMINI', '1') == '1':
+            self.speculation.submit(('gemini', image_path, RECOMMENDED_PSM, language),
+                                    self._speculate_correction, image_path, RECOMMENDED_PSM, language)
+        self._speculate_ocr(image_path, AUTO_DETECT_PSM_MODES, language)
+    
+    def _speculate_ocr(self, image_path: str, psm_modes: Sequence[int], language: str):
+        """Jadwalkan OCR background untuk setiap PSM (urut prioritas)"""
+        for psm in psm_modes:
+            self.speculation.submit(('tesseract', image_path, psm, language),
+                                    self._speculate_tesseract, image_path, psm, language)
+    
+    def _speculate_tesseract(self, image_path: str, psm_mode: int, language: str) -> str:
+        """Task spekulatif: satu OCR Tesseract dengan prioritas background"""
+        with self._tesseract_slot('background'):
+            return self.model.extract_text_tesseract(image_path, psm_mode, language)
+    
+    def _speculate_correction(self, image_path: str, psm_mode: int, language: str) -> Optional[Dict]:
+        """
+        Task spekulatif: koreksi Gemini untuk OCR (gambar, PSM, language)
+        
+        Request dibatasi OCR_SPECULATIVE_GEMINI_TIMEOUT (default 10 detik) supaya
+        tidak menahan akhir sesi. Koreksi yang gagal/timeout tidak di-cache (None),
+        sehingga request interaktif menjalankan koreksinya sendiri.
+        """
+        raw_text = self._extract_text(image_path, psm_mode, language, 'background')
+        deadline = time.monotonic() + float(os.getenv('OCR_SPECULATIVE_GEMINI_TIMEOUT', '10'))
+        with self.scheduler.slot('gemini', 'background'):
+            check_cancelled()
+            result = self.model.correct_typo_with_gemini(raw_text, deadline=deadline)
+        return result if result['success'] else None
+    
+    def _narrow_speculation(self, image_path: str, psm_mode: int):
+        """PSM sudah dipilih: batalkan probing PSM lain"""
+        if self.speculation:
+            self.speculation.cancel(
+                keep=lambda key: key[1] == image_path and (len(key) < 3 or key[2] == psm_mode)
+            )
+    
+    def _new_speculation(self) -> SpeculativeCache:
+        """Satu thread per slot Tesseract + satu untuk request Gemini yang menunggu jaringan"""
+        return SpeculativeCache(self.scheduler.capacity('tesseract') + 1)
+    
+    def _speculative(self, key):
+        """Hasil spekulatif untuk key, None jika tidak ada (caller menjalankan sendiri)"""
+        return self.speculation.get(key) if self.speculation else None
+    
+    def _stop_speculation(self):
+        """Batalkan sisa kerja spekulatif di akhir sesi interaktif"""
+        if self.speculation:
+            self.speculation.close()
+            self.speculation = None
+    
+    def _handle_results(self, result: OCRResult):
         """Handle and display results"""
         try:
-            # Step 4: Save results
+            # Step 4: Save results (satu snapshot untuk file dan ringkasan)
             self.view.show_processing_status("saving", result['image_name'])
-            output_file = self.model.save_results(result)
+            with self._stage('post_process_text'):
+                snapshot = result.to_dict()
+            with self._stage('save_results'):
+                output_file = self.model.save_results(snapshot)
             
             # Display comprehensive results
-            self.view.show_results_summary(result)
+            self.view.show_results_summary(snapshot)
             
             # Show save confirmation
             self.view.show_save_confirmation(output_file)
@@ -192,7 +448,9 @@ class OCRController:
         except Exception as e:
             self.view.show_error(f"Error saat menyimpan hasil: {e}")
     
-    def process_single_image(self, image_path: str, psm_mode: int = 6, save_results: bool = True) -> Optional[Dict]:
+    def process_single_image(self, image_path: str, psm_mode: int = 6, save_results: bool = True,
+                             priority: str = 'interactive', deadline: Optional[float] = None,
+                             form_template: Optional[str] = None, language: Optional[str] = None) -> Optional[Dict]:
         """
         Process single image programmatically (for API usage)
         
@@ -200,59 +458,276 @@ class OCRController:
             image_path: Path to image file
             psm_mode: PSM mode to use
             save_results: Whether to save results to file
+            priority: Priority class (default 'interactive' mendahului batch)
+            deadline: Batas waktu absolut (time.monotonic()) untuk request ini
+            form_template: Nama template form (lihat models.form_templates);
+                hasil berisi 'fields' dengan nilai per field
+            language: Language pack Tesseract (mis. 'ind'); default deteksi otomatis
             
         Returns:
             Processing result dictionary or None if failed
+            
+            Hasil tunggal tetap dict biasa (bisa langsung json.dumps), karena
+            penghematan memori OCRResult hanya berarti untuk banyak hasil sekaligus.
         """
         try:
             if not os.path.exists(image_path):
                 return None
             
-            result = self._process_image(image_path, psm_mode)
+            result = self._process_image(image_path, psm_mode, priority, deadline=deadline,
+                                         form_template=form_template, language=language)
+            
+            if not result:
+                return None
             
-            if result and save_results:
-                self.model.save_results(result)
+            with self._stage('post_process_text'):
+                snapshot = result.to_dict()
+            if save_results:
+                with self._stage('save_results'):
+                    self.model.save_results(snapshot)
             
-            return result
+            return snapshot
             
         except Exception:
             return None
     
-    def batch_process_images(self, directory: str = "gambar", psm_mode: int = 6) -> List[Dict]:
+    def batch_process_images(self, directory: str = "gambar", psm_mode: int = 6,
+                             priority: str = 'batch', job_id: Optional[str] = None,
+                             workers: Optional[int] = None, image_timeout: Optional[float] = None,
+                             form_template: Optional[str] = None, language: Optional[str] = None) -> List[OCRResult]:
         """
         Process all images in directory
         
+        Wrapper di atas iter_process_images() yang mengumpulkan semua hasil
+        dalam urutan file (bukan urutan selesai). Hasil berupa OCRResult (Mapping
+        read-only) supaya batch besar di memori tidak menyimpan raw/corrected/final
+        text tiga kali; pakai result.to_dict() untuk json.dumps atau dict yang bisa
+        diubah. Untuk folder besar gunakan iter_process_images() langsung.
+        
         Args:
             directory: Directory containing images
             psm_mode: PSM mode to use for all images
+            priority: Priority class untuk seluruh batch
+            job_id: ID batch untuk fair-share antar batch (default: ID unik)
+            workers: Jumlah gambar yang diproses paralel
+            image_timeout: SLA per gambar dalam detik (deadline untuk koreksi Gemini)
+            form_template: Nama template form untuk semua gambar di folder
+            language: Language pack untuk semua gambar (default: .ocr.json folder atau otomatis)
             
         Returns:
             List of processing results
         """
-        results = []
+        indexed = sorted(
+            self._iter_indexed(directory, psm_mode, priority=priority, job_id=job_id,
+                               workers=workers, image_timeout=image_timeout,
+                               form_template=form_template, language=language),
+            key=lambda item: item[0]
+        )
+        return [result for _, result in indexed]
+    
+    def iter_process_images(self, directory: str = "gambar", psm_mode: int = 6,
+                            priority: str = 'batch', job_id: Optional[str] = None,
+                            workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                            save_results: bool = True, drop_texts: bool = False,
+                            image_timeout: Optional[float] = None,
+                            form_template: Optional[str] = None,
+                            language: Optional[str] = None) -> Iterator[OCRResult]:
+        """
+        Process all images in directory sebagai generator
+        
+        Hasil di-yield segera setelah selesai (urutan selesai, bukan urutan file).
+        Gambar baru hanya disubmit saat jumlah in-flight di bawah max_in_flight,
+        sehingga consumer yang lambat otomatis menahan producer (backpressure).
+        
+        Args:
+            directory: Directory containing images
+            psm_mode: PSM mode to use for all images
+            priority: Priority class untuk seluruh batch
+            job_id: ID batch untuk fair-share antar batch (default: ID unik)
+            workers: Jumlah gambar yang diproses paralel (default: slot Tesseract)
+            max_in_flight: Batas gambar yang sedang diproses/menunggu di-yield
+                (default: 2x workers)
+            save_results: Simpan setiap hasil ke file
+            drop_texts: Buang raw_text/corrected_text/final_text dari hasil
+                setelah disimpan ke file (hanya berlaku jika save_results=True)
+            image_timeout: SLA per gambar dalam detik, dihitung sejak gambar mulai diproses
+            form_template: Nama template form untuk semua gambar di folder
+            language: Language pack untuk semua gambar (default: .ocr.json folder atau otomatis)
+            
+        Yields:
+            OCRResult per gambar yang berhasil (akses seperti dict, to_dict()
+            untuk dict biasa)
+        """
+        indexed = self._iter_indexed(directory, psm_mode, priority, job_id, workers, max_in_flight,
+                                     save_results, drop_texts, image_timeout, form_template, language)
+        try:
+            for _, result in indexed:
+                yield result
+        finally:
+            # Consumer berhenti lebih awal: tutup generator dalam supaya sisa gambar dibatalkan
+            indexed.close()
+    
+    def _iter_indexed(self, directory: str = "gambar", psm_mode: int = 6,
+                      priority: str = 'batch', job_id: Optional[str] = None,
+                      workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                      save_results: bool = True, drop_texts: bool = False,
+                      image_timeout: Optional[float] = None,
+                      form_template: Optional[str] = None,
+                      language: Optional[str] = None) -> Iterator[Tuple[int, OCRResult]]:
+        """iter_process_images() dengan index file (urutan find_image_files) per hasil"""
+        job_id = job_id or uuid.uuid4().hex
+        if form_template:
+            # Validasi sekali di awal, bukan gagal per gambar
+            load_form_template(form_template)
         image_files = self.model.find_image_files(directory)
         
         if not image_files:
             self.view.show_error(f"Tidak ada gambar ditemukan di folder '{directory}'")
-            return results
+            return
+        
+        workers = workers or self.scheduler.capacity('tesseract')
+        max_in_flight = max(max_in_flight or workers * 2, 1)
+        total = len(image_files)
+        succeeded = 0
+        self.last_batch_usage = usage_totals = self._empty_usage_totals()
         
-        self.view.show_info(f"Memproses {len(image_files)} gambar dalam batch mode...", "🔄")
+        self.view.show_info(f"Memproses {total} gambar dalam batch mode...", "🔄")
         
-        for i, image_path in enumerate(image_files, 1):
-            try:
-                self.view.show_info(f"[{i}/{len(image_files)}] Processing {os.path.basename(image_path)}", "📸")
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = {}
+        files = iter(enumerate(image_files, 1))
+        
+        try:
+            while True:
+                # Isi window in-flight hanya sebanyak yang diizinkan
+                while len(pending) < max_in_flight:
+                    item = next(files, None)
+                    if item is None:
+                        break
+                    i, image_path = item
+                    self.view.show_info(f"[{i}/{total}] Processing {os.path.basename(image_path)}", "📸")
+                    future = executor.submit(self._process_and_persist, image_path, psm_mode, priority,
+                                             job_id, save_results, drop_texts, image_timeout,
+                                             form_template, language)
+                    pending[future] = (i, image_path)
+                
+                if not pending:
+                    break
                 
-                result = self._process_image(image_path, psm_mode)
-                if result:
-                    # Save each result
-                    self.model.save_results(result)
-                    results.append(result)
-                    self.view.show_success(f"Berhasil: {result['image_name']}")
-                else:
-                    self.view.show_warning(f"Gagal: {os.path.basename(image_path)}")
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, image_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.view.show_error(f"Error processing {os.path.basename(image_path)}: {e}")
+                        continue
                     
-            except Exception as e:
-                self.view.show_error(f"Error processing {os.path.basename(image_path)}: {e}")
+                    if result:
+                        succeeded += 1
+                        self._add_usage(usage_totals, result.get('usage'))
+                        self.view.show_success(f"Berhasil: {result['image_name']}")
+                        yield i, result
+                    else:
+                        self.view.show_warning(f"Gagal: {os.path.basename(image_path)}")
+        finally:
+            # Consumer berhenti lebih awal: batalkan gambar yang belum mulai
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+        
+        self.view.show_success(f"Batch processing selesai: {succeeded}/{total} berhasil")
+        self.view.show_usage_summary(usage_totals)
+        self.view.show_scheduler_stats(self.get_scheduler_stats())
+    
+    def _process_and_persist(self, image_path: str, psm_mode: int, priority: str, job_id: Optional[str],
+                             save_results: bool, drop_texts: bool,
+                             image_timeout: Optional[float] = None,
+                             form_template: Optional[str] = None,
+                             language: Optional[str] = None) -> Optional[Dict]:
+        """Process satu gambar, simpan hasil, dan buang teks besar jika diminta"""
+        deadline = time.monotonic() + image_timeout if image_timeout else None
+        result = self._process_image(image_path, psm_mode, priority, job_id, deadline,
+                                     form_template, language)
+        
+        if result and save_results:
+            with self._stage('post_process_text'):
+                snapshot = result.to_dict()
+            with self._stage('save_results'):
+                result['output_file'] = self.model.save_results(snapshot)
+            if drop_texts:
+                result.drop_texts()
+        
+        return result
+    
+    @staticmethod
+    def _empty_usage_totals() -> Dict:
+        return {'calls': 0, 'prompt_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0,
+                'total_tokens': 0, 'latency_ms': 0.0, 'templates': {}}
+    
+    @staticmethod
+    def _add_usage(totals: Dict, usage: Optional[Dict]):
+        """Akumulasi token dan latency Gemini per batch"""
+        if not usage:
+            return
+        totals['calls'] += 1
+        for key in ('prompt_tokens', 'output_tokens', 'cached_tokens', 'total_tokens', 'latency_ms'):
+            totals[key] += usage.get(key, 0)
+        template = usage.get('prompt_template')
+        totals['templates'][template] = totals['templates'].get(template, 0) + 1
+    
+    def enable_profiling(self, output_dir: Optional[str] = None, mode: str = 'deterministic'):
+        """
+        Aktifkan profiling per stage pipeline
+        
+        Args:
+            output_dir: Folder output profile (default: profile_<timestamp>)
+            mode: 'deterministic' (cProfile + sampler) atau 'sampled' (sampler saja)
+        """
+        # Import di sini: cProfile/pstats tidak perlu di-load jika profiling tidak dipakai
+        from models.profiler import PipelineProfiler
+        
+        self.profiler = PipelineProfiler(output_dir, mode)
+        self.model.profiler = self.profiler
+    
+    def finish_profiling(self) -> Optional[Dict]:
+        """Hentikan profiling, tulis file pstats/collapsed stack dan tampilkan ringkasan"""
+        if not self.profiler:
+            return None
+        
+        summary = self.profiler.finish()
+        self.profiler = None
+        self.model.profiler = None
+        self.view.show_profile_summary(summary)
+        return summary
+    
+    @contextmanager
+    def _tesseract_slot(self, priority: str, job_id: Optional[str] = None,
+                        deadline: Optional[float] = None):
+        """
+        Slot Tesseract yang menghormati deadline request
         
-        self.view.show_success(f"Batch processing selesai: {len(results)}/{len(image_files)} berhasil")
-        return results
+        Raises:
+            DeadlineExceeded: Jika deadline lewat sebelum slot diminta atau
+                selama menunggu slot
+            CancelledError: Jika dipanggil dari task spekulatif yang sudah dibatalkan
+        """
+        remaining_seconds(deadline)
+        with self.scheduler.slot('tesseract', priority, job_id):
+            remaining_seconds(deadline)
+            check_cancelled()
+            yield
+    
+    def _gemini_slot(self, priority: str, job_id: Optional[str] = None, deadline: Optional[float] = None):
+        """Slot Gemini; tanpa slot jika deadline sudah lewat (koreksi langsung fallback ke teks original)"""
+        if deadline is not None and deadline <= time.monotonic():
+            return nullcontext()
+        return self.scheduler.slot('gemini', priority, job_id)
+    
+    def _stage(self, name: str):
+        """Context manager profiling untuk satu stage (no-op jika profiling nonaktif)"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+    
+    def get_scheduler_stats(self) -> Dict:
+        """Get queue depth dan wait time per priority class"""
+        return self.scheduler.stats()
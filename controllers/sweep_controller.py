@@ -0,0 +1,101 @@
+# controllers/sweep_controller.py
+"""
+Controller untuk sweep akurasi vs kecepatan (python main.py sweep)
+Menjalankan grid setting pada gambar dengan ground truth dan menampilkan
+tabel Pareto CER/WER vs latency dan token Gemini
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence
+
+from models.language import detect_language
+from models.ocr_model import find_image_files, load_env_once, probe_tesseract, run_tesseract
+from models.preprocessing import PREPROCESS_METHODS, preprocess_image
+from models.sweep import build_grid, find_ground_truth, run_sweep, save_sweep_csv
+from models.tuning import resolve_worker_config
+from views.ocr_view import OCRView
+
+DEFAULT_SWEEP_PSM = (3, 6, 11)
+DEFAULT_SWEEP_PREPROCESS = ('none', 'grayscale', 'binarize')
+DEFAULT_SWEEP_LANGUAGES = ('ind+eng', 'auto')
+DEFAULT_SWEEP_GEMINI = (False,)
+
+
+class SweepController:
+    """Controller untuk sweep grid setting OCR terhadap ground truth"""
+
+    def __init__(self, api_key: Optional[str] = None):
+        load_env_once()
+        self.view = OCRView()
+        self.api_key = api_key
+
+    def run(self, directory: str, psm_modes: Sequence[int] = DEFAULT_SWEEP_PSM,
+            preprocess: Sequence[str] = DEFAULT_SWEEP_PREPROCESS,
+            languages: Sequence[str] = DEFAULT_SWEEP_LANGUAGES,
+            gemini: Sequence[bool] = DEFAULT_SWEEP_GEMINI,
+            workers: Optional[int] = None, output_file: Optional[str] = None) -> List[Dict]:
+        """
+        Jalankan sweep pada gambar di folder yang punya <nama>.gt.txt
+
+        Args:
+            directory: Folder berisi gambar dan file ground truth
+            psm_modes: PSM mode yang dicoba
+            preprocess: Metode preprocessing yang dicoba (lihat models.preprocessing)
+            languages: Language pack yang dicoba ('auto' = deteksi per gambar)
+            gemini: Koreksi Gemini yang dicoba (False/True)
+            workers: Jumlah OCR paralel (default: profil tuning host ini)
+            output_file: Path CSV hasil (default: sweep_<timestamp>.csv)
+
+        Returns:
+            Row per konfigurasi (lihat models.sweep.run_sweep), kosong jika gagal
+        """
+        if not probe_tesseract()['available']:
+            self.view.show_error("Tesseract tidak ditemukan", "Install Tesseract sebelum menjalankan sweep")
+            return []
+
+        unknown = [method for method in preprocess if method not in PREPROCESS_METHODS]
+        if unknown:
+            self.view.show_error(f"Metode preprocessing tidak dikenal: {', '.join(unknown)}",
+                                 f"Pilih dari: {', '.join(PREPROCESS_METHODS)}")
+            return []
+
+        samples = find_ground_truth(find_image_files(directory))
+        if not samples:
+            self.view.show_error(f"Tidak ada gambar dengan ground truth di folder '{directory}'",
+                                 "Simpan teks yang benar sebagai <nama gambar>.gt.txt di samping gambar")
+            return []
+
+        worker_config = resolve_worker_config()
+        available = probe_tesseract()['languages']
+
+        def ocr(image_path: str, config: Dict) -> str:
+            language = config['language']
+            if language == 'auto':
+                language = detect_language(image_path, available)['language']
+            image = image_path
+            if config['preprocess'] != 'none':
+                image = preprocess_image(image_path, config['preprocess'])
+            return run_tesseract(image, config['psm_mode'], languages=language,
+                                 thread_limit=worker_config['threads_per_process'])
+
+        correct = None
+        if any(gemini):
+            from models.ocr_model import OCRModel
+            model = OCRModel(self.api_key)
+
+            def correct(text: str):
+                result = model.correct_typo_with_gemini(text)
+                usage = result.get('usage') or {}
+                return result['corrected_text'], usage.get('total_tokens', 0)
+
+        grid = build_grid(psm_modes, preprocess, languages, gemini)
+        self.view.show_info(
+            f"Sweep {len(grid)} konfigurasi x {len(samples)} gambar dari '{directory}'", "🧪"
+        )
+        rows = run_sweep(samples, grid, ocr, correct,
+                         workers=workers or worker_config['processes'],
+                         gemini_workers=int(os.getenv('OCR_GEMINI_CONCURRENCY', '4')))
+
+        path = save_sweep_csv(rows, output_file)
+        self.view.show_sweep_table(rows, path)
+        return rows
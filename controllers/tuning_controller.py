@@ -0,0 +1,62 @@
+# controllers/tuning_controller.py
+"""
+Controller untuk kalibrasi worker (python main.py tune)
+Mengukur throughput Tesseract untuk beberapa split proses x thread dan
+menyimpan split terbaik sebagai profil default host ini
+"""
+
+import os
+from typing import Dict, Optional
+
+from models.ocr_model import find_image_files, load_env_once, probe_tesseract
+from models.tuning import calibrate, load_profile, save_profile, tuning_file
+from views.ocr_view import OCRView
+
+# Jumlah gambar contoh maksimum yang dipakai untuk kalibrasi
+MAX_SAMPLE_IMAGES = 8
+
+
+class TuningController:
+    """Controller untuk auto-tuning konfigurasi worker Tesseract"""
+
+    def __init__(self, profile_path: Optional[str] = None):
+        load_env_once()
+        self.view = OCRView()
+        self.profile_path = profile_path or tuning_file()
+
+    def run(self, directory: str = "gambar", psm_mode: int = 6, jobs: Optional[int] = None) -> Optional[Dict]:
+        """
+        Jalankan kalibrasi dengan gambar contoh dari folder dan simpan profilnya
+
+        Returns:
+            Profil yang disimpan, atau None jika kalibrasi tidak bisa dijalankan
+        """
+        if not probe_tesseract()['available']:
+            self.view.show_error("Tesseract tidak ditemukan", "Install Tesseract sebelum menjalankan kalibrasi")
+            return None
+
+        image_files = find_image_files(directory)[:MAX_SAMPLE_IMAGES]
+        if not image_files:
+            self.view.show_error(f"Tidak ada gambar contoh di folder '{directory}'")
+            return None
+
+        self.view.show_info(
+            f"Kalibrasi Tesseract dengan {len(image_files)} gambar contoh dari '{directory}'", "🎛️"
+        )
+        try:
+            profile = calibrate(image_files, psm_mode, jobs=jobs, progress=self.view.show_tuning_step)
+        except ValueError as e:
+            self.view.show_error(str(e), "Cek memori host dan instalasi Tesseract")
+            return None
+        path = save_profile(profile, self.profile_path)
+        self.view.show_tuning_profile(profile, path)
+        return profile
+
+    def ensure_profile(self, directory: str = "gambar", psm_mode: int = 6) -> Optional[Dict]:
+        """Kalibrasi hanya jika host ini belum punya profil (dipakai oleh OCR_AUTOTUNE=1)"""
+        profile = load_profile(self.profile_path)
+        if profile is not None:
+            return profile
+        if not os.path.isdir(directory):
+            return None
+        return self.run(directory, psm_mode)
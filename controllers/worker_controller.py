@@ -0,0 +1,183 @@
+# controllers/worker_controller.py
+"""
+Controller untuk distributed OCR processing
+Coordinator meng-enqueue gambar ke shared job queue, worker di setiap node
+meng-claim job, memprosesnya, dan menulis hasil ke shared result sink
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from models.job_queue import create_job_queue
+from models.ocr_model import find_image_files, load_env_once
+from models.result_sink import JsonlResultSink
+from models.tuning import resolve_worker_config
+from views.ocr_view import OCRView
+
+DEFAULT_QUEUE_URL = "sqlite:///ocr_queue/jobs.db"
+DEFAULT_RESULT_DIR = "ocr_queue/results"
+
+
+class WorkerController:
+    """Controller untuk coordinator (enqueue) dan worker (claim & process)"""
+
+    def __init__(self, queue_url: Optional[str] = None, result_dir: Optional[str] = None,
+                 lease_seconds: Optional[float] = None):
+        """
+        Initialize Worker Controller
+
+        Args:
+            queue_url: URL job queue (default dari OCR_QUEUE_URL)
+            result_dir: Shared directory untuk hasil (default dari OCR_RESULT_DIR)
+            lease_seconds: Lease timeout job (default dari OCR_LEASE_SECONDS)
+        """
+        load_env_once()
+        self.view = OCRView()
+        self.queue_url = queue_url or os.getenv('OCR_QUEUE_URL', DEFAULT_QUEUE_URL)
+        self.result_dir = result_dir or os.getenv('OCR_RESULT_DIR', DEFAULT_RESULT_DIR)
+        self.lease_seconds = lease_seconds or float(os.getenv('OCR_LEASE_SECONDS', '120'))
+        self.queue = create_job_queue(self.queue_url, lease_seconds=self.lease_seconds)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    def enqueue_directory(self, directory: str = "gambar", psm_mode: int = 6) -> int:
+        """
+        Enqueue semua gambar dalam folder ke job queue
+
+        Path disimpan absolut supaya worker di node lain (dengan shared volume
+        yang di-mount di path yang sama) bisa membacanya.
+        """
+        image_files = [os.path.abspath(path) for path in find_image_files(directory)]
+
+        if not image_files:
+            self.view.show_error(f"Tidak ada gambar ditemukan di folder '{directory}'")
+            return 0
+
+        count = self.queue.enqueue(image_files, psm_mode)
+        self.view.show_success(f"{count} gambar masuk ke queue {self.queue_url}")
+        return count
+
+    def run_worker(self, api_key: Optional[str] = None, drain: bool = False,
+                   poll_interval: float = 2.0, max_jobs: Optional[int] = None,
+                   concurrency: Optional[int] = None) -> int:
+        """
+        Jalankan worker loop: claim job, proses, tulis hasil, ulangi
+
+        Args:
+            api_key: Optional API key override
+            drain: Berhenti saat queue kosong (default: terus polling)
+            poll_interval: Jeda polling saat queue kosong (detik)
+            max_jobs: Batas jumlah job yang diproses worker ini
+            concurrency: Jumlah job yang diproses paralel (default: jumlah
+                proses Tesseract dari profil tuning host ini)
+
+        Returns:
+            Jumlah job yang berhasil diproses
+        """
+        from controllers.ocr_controller import OCRController
+
+        controller = OCRController(api_key)
+        sink = JsonlResultSink(self.result_dir)
+        concurrency = concurrency or resolve_worker_config()['processes']
+        state = {'claimed': 0, 'processed': 0, 'lock': threading.Lock()}
+
+        self.view.show_info(
+            f"Worker {self.worker_id} siap (queue: {self.queue_url}, {concurrency} job paralel)", "👷"
+        )
+
+        loops = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(controller, sink, state, drain, poll_interval, max_jobs),
+                name=f"ocr-worker-{index}", daemon=True
+            )
+            for index in range(1, concurrency)
+        ]
+        for loop in loops:
+            loop.start()
+        self._worker_loop(controller, sink, state, drain, poll_interval, max_jobs)
+        for loop in loops:
+            loop.join()
+
+        processed = state['processed']
+        self.view.show_success(f"Worker selesai: {processed} job diproses, hasil di {sink.output_file}")
+        return processed
+
+    def _worker_loop(self, controller, sink: JsonlResultSink, state: Dict, drain: bool,
+                     poll_interval: float, max_jobs: Optional[int]):
+        """Satu loop claim-proses; beberapa loop berbagi controller, sink dan counter"""
+        while True:
+            with state['lock']:
+                if max_jobs is not None and state['claimed'] >= max_jobs:
+                    return
+                state['claimed'] += 1
+
+            try:
+                job = self.queue.claim(self.worker_id)
+            except Exception as e:
+                # Mis. 'database is locked' di SQLite shared volume: coba lagi, jangan matikan loop
+                with state['lock']:
+                    state['claimed'] -= 1
+                self.view.show_error(f"Claim job gagal: {e}")
+                time.sleep(poll_interval)
+                continue
+
+            if job is None:
+                with state['lock']:
+                    state['claimed'] -= 1
+                if drain:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            image_name = os.path.basename(job['image_path'])
+            self.view.show_info(f"Job {job['id']} (attempt {job['attempts']}): {image_name}", "📸")
+
+            stop_heartbeat = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat_loop, args=(job['id'], stop_heartbeat), daemon=True
+            )
+            heartbeat.start()
+
+            try:
+                result = controller.process_single_image(
+                    job['image_path'], job['psm_mode'], save_results=False, priority='batch'
+                )
+                if not result:
+                    self.queue.fail(job['id'], self.worker_id, "processing gagal")
+                    self.view.show_warning(f"Gagal: {image_name}")
+                elif not self.queue.heartbeat(job['id'], self.worker_id):
+                    # Lease sudah di-claim ulang worker lain: hasil tidak ditulis supaya tidak dobel
+                    self.view.show_warning(f"Lease job {job['id']} hilang, hasil {image_name} tidak ditulis")
+                else:
+                    sink.write(result, job['id'])
+                    if self.queue.complete(job['id'], self.worker_id):
+                        with state['lock']:
+                            state['processed'] += 1
+                        self.view.show_success(f"Berhasil: {image_name}")
+                    else:
+                        # Delivery at-least-once: worker lain bisa menulis hasil job yang sama
+                        self.view.show_warning(
+                            f"Lease job {job['id']} hilang setelah hasil ditulis; "
+                            f"hasil {image_name} bisa dobel (dedup per job_id)"
+                        )
+            except Exception as e:
+                self.queue.fail(job['id'], self.worker_id, str(e))
+                self.view.show_error(f"Error processing {image_name}: {e}")
+            finally:
+                stop_heartbeat.set()
+                heartbeat.join()
+
+    def _heartbeat_loop(self, job_id, stop_event: threading.Event):
+        """Perpanjang lease secara berkala selama job diproses"""
+        interval = max(self.lease_seconds / 3, 1.0)
+        while not stop_event.wait(interval):
+            try:
+                if not self.queue.heartbeat(job_id, self.worker_id):
+                    self.view.show_warning(f"Lease job {job_id} hilang, job mungkin di-claim worker lain")
+                    return
+            except Exception as e:
+                self.view.show_warning(f"Heartbeat job {job_id} gagal: {e}")
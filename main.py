@@ -8,12 +8,46 @@ Main entry point untuk aplikasi OCR
 
 import sys
 import os
-from typing import Optional
+import time
+from typing import Dict, Optional
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from controllers.ocr_controller import OCRController
+# Controller di-import secara lazy di tiap entry point supaya command ringan
+# seperti `help` tidak ikut memuat seluruh MVC stack
+_controllers: Dict[Optional[str], object] = {}
+
+
+def get_controller(api_key: Optional[str] = None):
+    """
+    Get OCRController yang dipakai ulang per API key
+    
+    Controller (beserta load .env dan probe Tesseract) cukup dibuat sekali
+    per proses, sehingga pemanggilan berulang tidak membayar biaya startup lagi.
+    """
+    controller = _controllers.get(api_key)
+    if controller is None:
+        from controllers.ocr_controller import OCRController
+        controller = OCRController(api_key)
+        _controllers[api_key] = controller
+    return controller
+
+
+def autotune(directory: Optional[str] = None, psm_mode: int = 6):
+    """
+    Kalibrasi worker saat startup jika OCR_AUTOTUNE=1 dan host belum punya profil
+    
+    Harus dipanggil sebelum controller (dan scheduler) dibuat supaya profil
+    langsung dipakai sebagai konfigurasi default.
+    """
+    from models.ocr_model import load_env_once
+    load_env_once()
+    if os.getenv('OCR_AUTOTUNE') != '1':
+        return
+    
+    from controllers.tuning_controller import TuningController
+    TuningController().ensure_profile(directory or os.getenv('OCR_TUNING_SAMPLES', 'gambar'), psm_mode)
 
 
 def main():
@@ -22,6 +56,7 @@ def main():
     """
     try:
         # Initialize dan jalankan controller
+        from controllers.ocr_controller import OCRController
         controller = OCRController()
         controller.run()
         
@@ -39,25 +74,37 @@ def main():
         sys.exit(1)
 
 
-def batch_mode(directory: str = "gambar", psm_mode: int = 6):
+def batch_mode(directory: str = "gambar", psm_mode: int = 6, profile: Optional[str] = None,
+               form_template: Optional[str] = None, language: Optional[str] = None):
     """
     Batch processing mode untuk memproses semua gambar dalam folder
     
     Args:
         directory: Folder yang berisi gambar
         psm_mode: PSM mode yang akan digunakan
+        profile: Optional profiling mode ('deterministic' atau 'sampled')
+        form_template: Optional template form (OCR per field region)
+        language: Optional language pack Tesseract (default: otomatis)
     """
     try:
-        controller = OCRController()
-        results = controller.batch_process_images(directory, psm_mode)
-        return results
+        autotune(directory, psm_mode)
+        controller = get_controller()
+        if profile:
+            controller.enable_profiling(mode=profile)
+        try:
+            return controller.batch_process_images(directory, psm_mode, form_template=form_template,
+                                                   language=language)
+        finally:
+            controller.finish_profiling()
         
     except Exception as e:
         print(f"❌ Batch processing error: {e}")
         return []
 
 
-def process_single(image_path: str, psm_mode: int = 6, api_key: Optional[str] = None) -> dict:
+def process_single(image_path: str, psm_mode: int = 6, api_key: Optional[str] = None,
+                   timeout: Optional[float] = None, profile: Optional[str] = None,
+                   form_template: Optional[str] = None, language: Optional[str] = None) -> dict:
     """
     Process single image programmatically
     Berguna untuk integrasi dengan script lain
@@ -66,63 +113,255 @@ def process_single(image_path: str, psm_mode: int = 6, api_key: Optional[str] =
         image_path: Path ke file gambar
         psm_mode: PSM mode (default: 6)
         api_key: Optional API key override
+        timeout: Optional batas waktu request dalam detik (dicek sebelum setiap slot
+            Tesseract, membatasi koreksi Gemini; lihat README)
+        profile: Optional profiling mode ('deterministic' atau 'sampled')
+        form_template: Optional template form; hasil berisi 'fields' per field
+        language: Optional language pack Tesseract (mis. 'ind'); default otomatis
         
     Returns:
         Dictionary dengan hasil processing
     """
     try:
-        controller = OCRController(api_key)
-        result = controller.process_single_image(image_path, psm_mode)
+        deadline = time.monotonic() + timeout if timeout else None
+        controller = get_controller(api_key)
+        if profile:
+            controller.enable_profiling(mode=profile)
+        try:
+            result = controller.process_single_image(image_path, psm_mode, deadline=deadline,
+                                                     form_template=form_template, language=language)
+        finally:
+            controller.finish_profiling()
         return result or {}
         
     except Exception as e:
         return {"error": str(e)}
 
 
+def enqueue_mode(directory: str = "gambar", psm_mode: int = 6) -> int:
+    """
+    Coordinator: enqueue semua gambar dalam folder ke shared job queue
+    
+    Args:
+        directory: Folder yang berisi gambar
+        psm_mode: PSM mode yang akan dipakai worker
+        
+    Returns:
+        Jumlah job yang di-enqueue
+    """
+    try:
+        from controllers.worker_controller import WorkerController
+        return WorkerController().enqueue_directory(directory, psm_mode)
+        
+    except Exception as e:
+        print(f"❌ Enqueue error: {e}")
+        return 0
+
+
+def worker_mode(drain: bool = False) -> int:
+    """
+    Worker: claim job dari shared job queue dan proses sampai dihentikan
+    
+    Args:
+        drain: Berhenti saat queue kosong
+        
+    Returns:
+        Jumlah job yang berhasil diproses
+    """
+    try:
+        from controllers.worker_controller import WorkerController
+        autotune()
+        return WorkerController().run_worker(drain=drain)
+        
+    except KeyboardInterrupt:
+        print("\n❌ Worker dihentikan oleh user")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ Worker error: {e}")
+        return 0
+
+
+def tune_mode(directory: str = "gambar", psm_mode: int = 6, jobs: Optional[int] = None) -> dict:
+    """
+    Kalibrasi split proses Tesseract x OMP_THREAD_LIMIT untuk host ini
+    
+    Profil disimpan ke OCR_TUNING_FILE dan dipakai sebagai konfigurasi
+    default batch dan worker mode.
+    
+    Args:
+        directory: Folder berisi gambar contoh
+        psm_mode: PSM mode yang dipakai saat kalibrasi
+        jobs: Jumlah gambar per split yang diukur
+        
+    Returns:
+        Profil tuning (kosong jika gagal)
+    """
+    try:
+        from controllers.tuning_controller import TuningController
+        return TuningController().run(directory, psm_mode, jobs) or {}
+        
+    except Exception as e:
+        print(f"❌ Tuning error: {e}")
+        return {}
+
+
+def sweep_mode(directory: str, psm_modes=None, preprocess=None, languages=None,
+               gemini=None, workers: Optional[int] = None) -> list:
+    """
+    Sweep grid setting OCR terhadap ground truth (<nama gambar>.gt.txt)
+    
+    Args:
+        directory: Folder berisi gambar dan file ground truth
+        psm_modes, preprocess, languages, gemini: Nilai grid per dimensi
+            (None = default di controllers.sweep_controller)
+        workers: Jumlah OCR paralel
+        
+    Returns:
+        Row per konfigurasi dengan CER/WER, latency, token dan flag Pareto
+    """
+    try:
+        from controllers import sweep_controller
+        grid = {
+            'psm_modes': psm_modes or sweep_controller.DEFAULT_SWEEP_PSM,
+            'preprocess': preprocess or sweep_controller.DEFAULT_SWEEP_PREPROCESS,
+            'languages': languages or sweep_controller.DEFAULT_SWEEP_LANGUAGES,
+            'gemini': gemini or sweep_controller.DEFAULT_SWEEP_GEMINI,
+        }
+        return sweep_controller.SweepController().run(directory, workers=workers, **grid)
+        
+    except Exception as e:
+        print(f"❌ Sweep error: {e}")
+        return []
+
+
+def _list_flag(flags: Dict, name: str) -> Optional[list]:
+    """Nilai flag dipisah koma (--psm=3,6,11), None jika tidak di-set"""
+    value = flags.get(name)
+    return [item.strip() for item in value.split(',') if item.strip()] if isinstance(value, str) else None
+
+
 if __name__ == "__main__":
     # Check untuk command line arguments
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
+    # Option flags (--xxx atau --xxx=value) dipisahkan dari argumen posisional
+    flags = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith('--'):
+            name, _, value = arg.partition('=')
+            flags[name] = value or True
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
+    # --profile => deterministic, --profile=sampled => sampled
+    profile = flags.get('--profile')
+    if profile is True:
+        profile = 'deterministic'
+    
+    # --template=<nama> => OCR per field region dari templates/<nama>.json
+    form_template = flags.get('--template') if isinstance(flags.get('--template'), str) else None
+    # --lang=ind / --lang=ind+eng / --lang=auto
+    language = flags.get('--lang') if isinstance(flags.get('--lang'), str) else None
+    
+    if args:
+        command = args[0].lower()
         
         if command == "batch":
             # Batch mode
-            directory = sys.argv[2] if len(sys.argv) > 2 else "gambar"
-            psm_mode = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+            directory = args[1] if len(args) > 1 else "gambar"
+            psm_mode = int(args[2]) if len(args) > 2 else 6
             
             print(f"🔄 Running in batch mode: {directory} (PSM: {psm_mode})")
-            batch_mode(directory, psm_mode)
+            batch_mode(directory, psm_mode, profile, form_template, language)
             
         elif command == "single":
             # Single file mode
-            if len(sys.argv) < 3:
+            if len(args) < 2:
                 print("❌ Usage: python main.py single <image_path> [psm_mode]")
                 sys.exit(1)
                 
-            image_path = sys.argv[2]
-            psm_mode = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+            image_path = args[1]
+            psm_mode = int(args[2]) if len(args) > 2 else 6
             
             print(f"📸 Processing single image: {image_path} (PSM: {psm_mode})")
-            result = process_single(image_path, psm_mode)
+            result = process_single(image_path, psm_mode, profile=profile, form_template=form_template,
+                                    language=language)
             
             if "error" in result:
                 print(f"❌ Error: {result['error']}")
             else:
                 print("✅ Processing completed successfully")
                 
+        elif command == "enqueue":
+            # Distributed mode: coordinator
+            if len(args) < 2:
+                print("❌ Usage: python main.py enqueue <dir> [psm_mode]")
+                sys.exit(1)
+                
+            directory = args[1]
+            psm_mode = int(args[2]) if len(args) > 2 else 6
+            
+            print(f"📥 Enqueue gambar dari: {directory} (PSM: {psm_mode})")
+            enqueue_mode(directory, psm_mode)
+            
+        elif command == "worker":
+            # Distributed mode: worker
+            worker_mode(drain="--drain" in flags)
+            
+        elif command == "tune":
+            # Auto-tuning worker untuk host ini
+            directory = args[1] if len(args) > 1 else "gambar"
+            psm_mode = int(args[2]) if len(args) > 2 else 6
+            jobs = int(flags['--jobs']) if isinstance(flags.get('--jobs'), str) else None
+            
+            tune_mode(directory, psm_mode, jobs)
+            
+        elif command == "sweep":
+            # Grid akurasi vs kecepatan terhadap ground truth
+            if len(args) < 2:
+                print("❌ Usage: python main.py sweep <dir> [--psm=3,6] [--preprocess=none,binarize] "
+                      "[--lang=ind,auto] [--gemini=off,on]")
+                sys.exit(1)
+            
+            psm_values = _list_flag(flags, '--psm')
+            gemini_values = _list_flag(flags, '--gemini')
+            sweep_mode(
+                args[1],
+                psm_modes=[int(value) for value in psm_values] if psm_values else None,
+                preprocess=_list_flag(flags, '--preprocess'),
+                languages=_list_flag(flags, '--lang'),
+                gemini=[value in ('on', '1', 'true') for value in gemini_values] if gemini_values else None,
+                workers=int(flags['--workers']) if isinstance(flags.get('--workers'), str) else None
+            )
+            
         elif command == "help":
             print("🤖 OCR Pipeline dengan Gemini 2.0 Flash - MVC Version")
             print("=" * 60)
             print("Usage:")
-            print("  python main.py                    # Interactive mode (default)")
-            print("  python main.py batch [dir] [psm]  # Batch process all images")
-            print("  python main.py single <img> [psm] # Process single image")
-            print("  python main.py help               # Show this help")
+            print("  python main.py                     # Interactive mode (default)")
+            print("  python main.py batch [dir] [psm]   # Batch process all images")
+            print("  python main.py single <img> [psm]  # Process single image")
+            print("      --profile[=sampled]            # Profile per stage (batch/single)")
+            print("      --template=<nama>              # OCR per field form (batch/single)")
+            print("      --lang=<ind|eng|ind+eng|auto>  # Language pack Tesseract (batch/single)")
+            print("  python main.py enqueue <dir> [psm] # Enqueue images ke shared job queue")
+            print("  python main.py worker [--drain]    # Proses job dari shared job queue")
+            print("  python main.py tune [dir] [psm]    # Kalibrasi proses x thread Tesseract")
+            print("      --jobs=N                       # Jumlah gambar per split (tune)")
+            print("  python main.py sweep <dir>         # Grid CER/WER vs latency (butuh <img>.gt.txt)")
+            print("      --psm= --preprocess= --lang= --gemini=off,on --workers=N")
+            print("  python main.py help                # Show this help")
             print()
             print("Examples:")
             print("  python main.py")
             print("  python main.py batch")
             print("  python main.py batch gambar 6")
             print("  python main.py single gambar/test.jpg 11")
+            print("  python main.py batch gambar 6 --profile")
+            print("  python main.py single gambar/ktp.jpg --template=ktp")
+            print("  python main.py batch surat --lang=ind")
+            print("  python main.py enqueue /mnt/shared/gambar 6")
+            print("  python main.py worker --drain")
+            print("  python main.py tune gambar 6 --jobs=16")
+            print("  python main.py sweep dataset --psm=4,6 --lang=ind,auto --gemini=off,on")
             
         else:
             print(f"❌ Unknown command: {command}")
@@ -0,0 +1,123 @@
+# models/form_templates.py
+"""
+Template region-of-interest untuk form yang layout-nya sudah diketahui
+Template (JSON) mendaftar field bernama dengan kotak region, PSM, whitelist
+karakter dan flag skip_correction per field. Hanya crop field yang di-OCR,
+dan hasilnya berupa map field -> nilai.
+
+Contoh templates/ktp.json:
+    {
+        "name": "ktp",
+        "language": "ind",
+        "fields": [
+            {"name": "nik", "box": [0.25, 0.12, 0.75, 0.20], "psm": 7,
+             "whitelist": "0123456789", "skip_correction": true},
+            {"name": "nama", "box": [0.25, 0.20, 0.75, 0.27], "psm": 7}
+        ]
+    }
+
+Box berupa [left, top, right, bottom], dalam fraksi ukuran gambar (0-1)
+atau dalam pixel jika ada nilai > 1.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+DEFAULT_TEMPLATE_DIR = "templates"
+
+# PSM default per field: satu baris teks
+DEFAULT_FIELD_PSM = 7
+
+
+def template_dir() -> str:
+    """Folder template form (OCR_TEMPLATE_DIR)"""
+    return os.getenv('OCR_TEMPLATE_DIR', DEFAULT_TEMPLATE_DIR)
+
+
+def _template_path(name: str) -> str:
+    if name.endswith('.json') or os.path.sep in name:
+        return name
+    return os.path.join(template_dir(), f"{name}.json")
+
+
+def _validate_field(field: Dict, source: str) -> Dict:
+    name = field.get('name')
+    box = field.get('box')
+    if not name or not isinstance(name, str):
+        raise ValueError(f"Field tanpa nama di template {source}")
+    if not isinstance(box, (list, tuple)) or len(box) != 4:
+        raise ValueError(f"Field '{name}' di template {source}: box harus [left, top, right, bottom]")
+
+    left, top, right, bottom = (float(value) for value in box)
+    if right <= left or bottom <= top:
+        raise ValueError(f"Field '{name}' di template {source}: box kosong atau terbalik")
+
+    return {
+        'name': name,
+        'box': (left, top, right, bottom),
+        'psm': int(field.get('psm', DEFAULT_FIELD_PSM)),
+        'whitelist': field.get('whitelist') or None,
+        'skip_correction': bool(field.get('skip_correction', False))
+    }
+
+
+@lru_cache(maxsize=32)
+def load_form_template(name: str) -> Dict:
+    """
+    Load dan validasi template form (di-cache per proses)
+
+    Args:
+        name: Nama template di OCR_TEMPLATE_DIR (tanpa .json) atau path file JSON
+
+    Returns:
+        Dictionary dengan 'name', 'source', 'language' (override language
+        pack, None = otomatis) dan 'fields'. Hasil di-cache,
+        jadi jangan dimodifikasi oleh caller.
+
+    Raises:
+        ValueError: Jika template tidak ditemukan atau tidak valid
+    """
+    path = _template_path(name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Template form tidak ditemukan: {path}")
+    except ValueError as e:
+        raise ValueError(f"Template form {path} bukan JSON yang valid: {e}")
+
+    fields = data.get('fields') if isinstance(data, dict) else None
+    if not fields:
+        raise ValueError(f"Template form {path} tidak punya field")
+
+    validated = tuple(_validate_field(field, path) for field in fields)
+    names = [field['name'] for field in validated]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Template form {path} punya nama field ganda")
+
+    return {
+        'name': data.get('name') or os.path.splitext(os.path.basename(path))[0],
+        'source': path,
+        'language': data.get('language') or None,
+        'fields': validated
+    }
+
+
+def pixel_box(image_size: Tuple[int, int], box: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+    """Konversi box template (fraksi atau pixel) ke box pixel yang dibatasi ukuran gambar"""
+    width, height = image_size
+    if all(value <= 1 for value in box):
+        box = (box[0] * width, box[1] * height, box[2] * width, box[3] * height)
+
+    left, top, right, bottom = (int(round(value)) for value in box)
+    return (
+        max(0, min(left, width)), max(0, min(top, height)),
+        max(0, min(right, width)), max(0, min(bottom, height))
+    )
+
+
+def format_fields(fields: Dict[str, Optional[str]]) -> str:
+    """Teks 'field: nilai' per baris (untuk file hasil dan ringkasan)"""
+    return '\n'.join(f"{name}: {value or ''}" for name, value in fields.items())
@@ -0,0 +1,78 @@
+# models/hedging.py
+"""
+Latency tracking dan hedged request untuk Gemini API
+Request duplikat dikirim hanya jika request pertama melewati p95 latency
+yang teramati, dengan budget supaya hedge tidak menghabiskan quota
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Deadline request sudah lewat sebelum/selama pemanggilan API"""
+
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """
+    Sisa waktu sampai deadline (time.monotonic()), None jika tanpa deadline
+
+    Raises:
+        DeadlineExceeded: Jika deadline sudah lewat
+    """
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline terlewati")
+    return remaining
+
+
+class LatencyTracker:
+    """Sliding window latency untuk menghitung persentil (mis. p95)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Persentil p (0-100), None jika sampel belum cukup"""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Batasi jumlah hedge sebagai rasio dari total request"""
+
+    def __init__(self, max_ratio: float = 0.05):
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.hedges = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_ratio > 0
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """True jika hedge boleh dikirim (dan langsung dihitung)"""
+        with self.lock:
+            if self.hedges + 1 > self.requests * self.max_ratio:
+                return False
+            self.hedges += 1
+            return True
@@ -0,0 +1,340 @@
+# models/job_queue.py
+"""
+Durable job queue untuk distributed OCR processing
+Coordinator meng-enqueue gambar, worker di node mana pun meng-claim job
+dengan lease timeout, heartbeat, dan re-queue otomatis saat worker crash
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+
+class SQLiteJobQueue:
+    """
+    Job queue berbasis SQLite di shared volume
+
+    Lease disimpan sebagai kolom `lease_expires`. Job yang lease-nya habis
+    (worker crash / tidak heartbeat) otomatis bisa di-claim ulang.
+    Journal mode default (bukan WAL) dipakai supaya aman di network filesystem.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    image_path TEXT NOT NULL,
+                    psm_mode INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    enqueued_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka koneksi baru (koneksi tidak dibagi antar thread)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Jalankan satu statement (autocommit), return jumlah baris terpengaruh"""
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).rowcount
+        finally:
+            conn.close()
+
+    def enqueue(self, image_paths: List[str], psm_mode: int = 6) -> int:
+        """Enqueue list gambar, return jumlah job yang ditambahkan"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO jobs (image_path, psm_mode, enqueued_at, updated_at) VALUES (?, ?, ?, ?)",
+                [(path, psm_mode, now, now) for path in image_paths]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(image_paths)
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Claim satu job pending atau job dengan lease kadaluarsa"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Job yang berulang kali membuat worker crash tidak di-claim lagi
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (now,)
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+                """,
+                (worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        return {
+            'id': row['id'],
+            'image_path': row['image_path'],
+            'psm_mode': row['psm_mode'],
+            'attempts': row['attempts'] + 1
+        }
+
+    def heartbeat(self, job_id, worker_id: str) -> bool:
+        """Perpanjang lease; False jika lease sudah diambil worker lain"""
+        now = time.time()
+        return self._execute(
+            """
+            UPDATE jobs SET lease_expires = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (now + self.lease_seconds, now, job_id, worker_id)
+        ) == 1
+
+    def complete(self, job_id, worker_id: str) -> bool:
+        """Tandai job selesai"""
+        return self._execute(
+            """
+            UPDATE jobs SET status = 'done', lease_expires = NULL, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (time.time(), job_id, worker_id)
+        ) == 1
+
+    def fail(self, job_id, worker_id: str, error: str) -> bool:
+        """Kembalikan job ke queue, atau tandai failed jika attempts habis"""
+        return self._execute(
+            """
+            UPDATE jobs SET
+                status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+            """,
+            (self.max_attempts, error, time.time(), job_id, worker_id)
+        ) == 1
+
+    def stats(self) -> Dict:
+        """Jumlah job per status"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update({row['status']: row['total'] for row in rows})
+        return counts
+
+
+class RedisJobQueue:
+    """
+    Job queue berbasis Redis (atau stand-in Redis-compatible lokal)
+
+    Pending job disimpan di list, lease di sorted set (score = waktu kadaluarsa).
+    Claim dilakukan atomik lewat Lua script yang juga me-requeue lease kadaluarsa;
+    heartbeat/complete/fail juga Lua script, sehingga cek lease_owner dan update
+    tidak bisa diselingi claim ulang oleh worker lain.
+    """
+
+    _CLAIM_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    -- Job yang berulang kali membuat worker crash tidak di-claim lagi
+    local attempts = tonumber(redis.call('HGET', ARGV[4] .. id, 'attempts') or '0')
+    if attempts >= tonumber(ARGV[5]) then
+        redis.call('HSET', ARGV[4] .. id, 'status', 'failed', 'error', 'lease expired', 'lease_owner', '')
+    else
+        redis.call('HSET', ARGV[4] .. id, 'status', 'pending', 'lease_owner', '')
+        redis.call('RPUSH', KEYS[1], id)
+    end
+end
+local id = redis.call('LPOP', KEYS[1])
+if not id then
+    return false
+end
+redis.call('ZADD', KEYS[2], ARGV[2], id)
+redis.call('HSET', ARGV[4] .. id, 'lease_owner', ARGV[3], 'status', 'leased')
+redis.call('HINCRBY', ARGV[4] .. id, 'attempts', 1)
+return id
+"""
+
+    # KEYS: leases, job hash; ARGV: worker_id, lease baru, job_id
+    _HEARTBEAT_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'lease_owner') ~= ARGV[1]
+        or redis.call('HGET', KEYS[2], 'status') ~= 'leased' then
+    return 0
+end
+redis.call('ZADD', KEYS[1], 'XX', ARGV[2], ARGV[3])
+return 1
+"""
+
+    # KEYS: leases, job hash; ARGV: worker_id, job_id
+    _COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'lease_owner') ~= ARGV[1]
+        or redis.call('HGET', KEYS[2], 'status') ~= 'leased' then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('HSET', KEYS[2], 'status', 'done', 'lease_owner', '')
+return 1
+"""
+
+    # KEYS: pending, leases, job hash; ARGV: worker_id, job_id, error, max_attempts
+    _FAIL_SCRIPT = """
+if redis.call('HGET', KEYS[3], 'lease_owner') ~= ARGV[1]
+        or redis.call('HGET', KEYS[3], 'status') ~= 'leased' then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[2])
+local attempts = tonumber(redis.call('HGET', KEYS[3], 'attempts') or '0')
+if attempts >= tonumber(ARGV[4]) then
+    redis.call('HSET', KEYS[3], 'status', 'failed', 'error', ARGV[3], 'lease_owner', '')
+else
+    redis.call('HSET', KEYS[3], 'status', 'pending', 'error', ARGV[3], 'lease_owner', '')
+    redis.call('RPUSH', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+    def __init__(self, url: str, name: str = "ocr", lease_seconds: float = 120.0, max_attempts: int = 3):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.pending_key = f"{name}:pending"
+        self.leases_key = f"{name}:leases"
+        self.job_prefix = f"{name}:job:"
+        self.counter_key = f"{name}:next_id"
+        self._claim = self.client.register_script(self._CLAIM_SCRIPT)
+        self._heartbeat = self.client.register_script(self._HEARTBEAT_SCRIPT)
+        self._complete = self.client.register_script(self._COMPLETE_SCRIPT)
+        self._fail = self.client.register_script(self._FAIL_SCRIPT)
+
+    def enqueue(self, image_paths: List[str], psm_mode: int = 6) -> int:
+        """Enqueue list gambar, return jumlah job yang ditambahkan"""
+        now = time.time()
+        for path in image_paths:
+            job_id = self.client.incr(self.counter_key)
+            pipe = self.client.pipeline()
+            pipe.hset(f"{self.job_prefix}{job_id}", mapping={
+                'image_path': path,
+                'psm_mode': psm_mode,
+                'status': 'pending',
+                'attempts': 0,
+                'enqueued_at': now
+            })
+            pipe.rpush(self.pending_key, job_id)
+            pipe.execute()
+        return len(image_paths)
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Claim satu job pending atau job dengan lease kadaluarsa"""
+        now = time.time()
+        job_id = self._claim(
+            keys=[self.pending_key, self.leases_key],
+            args=[now, now + self.lease_seconds, worker_id, self.job_prefix, self.max_attempts]
+        )
+        if not job_id:
+            return None
+
+        job = self.client.hgetall(f"{self.job_prefix}{job_id}")
+        return {
+            'id': job_id,
+            'image_path': job['image_path'],
+            'psm_mode': int(job['psm_mode']),
+            'attempts': int(job['attempts'])
+        }
+
+    def heartbeat(self, job_id, worker_id: str) -> bool:
+        """Perpanjang lease; False jika lease sudah diambil worker lain"""
+        return self._heartbeat(
+            keys=[self.leases_key, f"{self.job_prefix}{job_id}"],
+            args=[worker_id, time.time() + self.lease_seconds, job_id]
+        ) == 1
+
+    def complete(self, job_id, worker_id: str) -> bool:
+        """Tandai job selesai; False jika lease sudah diambil worker lain"""
+        return self._complete(
+            keys=[self.leases_key, f"{self.job_prefix}{job_id}"],
+            args=[worker_id, job_id]
+        ) == 1
+
+    def fail(self, job_id, worker_id: str, error: str) -> bool:
+        """Kembalikan job ke queue, atau tandai failed jika attempts habis"""
+        return self._fail(
+            keys=[self.pending_key, self.leases_key, f"{self.job_prefix}{job_id}"],
+            args=[worker_id, job_id, error, self.max_attempts]
+        ) == 1
+
+    def stats(self) -> Dict:
+        """Jumlah job pending dan leased"""
+        return {
+            'pending': self.client.llen(self.pending_key),
+            'leased': self.client.zcard(self.leases_key)
+        }
+
+
+def create_job_queue(url: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+    """
+    Buat job queue dari URL
+
+    Args:
+        url: 'redis://host:port/db' untuk Redis, 'sqlite:///path/jobs.db'
+             atau path file biasa untuk SQLite
+    """
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisJobQueue(url, lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    return SQLiteJobQueue(url, lease_seconds=lease_seconds, max_attempts=max_attempts)
@@ -0,0 +1,162 @@
+# models/language.py
+"""
+Pemilihan language pack Tesseract per gambar
+`-l ind+eng` membuat Tesseract mengevaluasi dua model untuk setiap kata.
+Deteksi murah (OCR satu language pada sampel beresolusi rendah + hit rate
+leksikon kata umum) memilih set language minimal untuk OCR penuh.
+"""
+
+import io
+import json
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+# Set language lama, dipakai jika deteksi tidak yakin
+DEFAULT_LANGUAGES = 'ind+eng'
+
+# File konfigurasi per folder, mis. {"language": "ind"}
+FOLDER_CONFIG_FILE = '.ocr.json'
+
+# Kata fungsi yang sangat umum dan tidak tumpang tindih antar bahasa
+LEXICONS = {
+    'ind': frozenset('''
+        yang dan di ke dari untuk dengan ini itu pada tidak dalam adalah akan
+        atau juga oleh sebagai telah sudah kami kita mereka saya anda tersebut
+        karena bahwa dapat harus ada bagi para serta namun jika maka agar
+        hingga sampai setelah sebelum antara tentang seperti masih lebih
+        sangat hanya belum bisa secara tahun bulan hari nomor jalan kota
+        alamat nama tanggal provinsi kabupaten kecamatan kelurahan desa
+        '''.split()),
+    'eng': frozenset('''
+        the and of to in for with this that on not is are was were will
+        be or also by as has have had we our they their you your it its
+        because can must there from but if then so until after before
+        between about like still more very only yet could should would
+        year month day number street city address name date which what
+        '''.split()),
+}
+
+_WORD_PATTERN = re.compile(r'[a-z]{2,}')
+
+
+def fallback_languages(available: Optional[Iterable[str]] = None) -> str:
+    """DEFAULT_LANGUAGES, dibatasi ke language yang terinstall (jika diketahui)"""
+    if available is None:
+        return DEFAULT_LANGUAGES
+    installed = [language for language in DEFAULT_LANGUAGES.split('+') if language in available]
+    return '+'.join(installed) or DEFAULT_LANGUAGES
+
+
+def lexicon_hit_rates(text: str, languages: Iterable[str] = LEXICONS) -> Dict:
+    """
+    Rasio kata yang ada di leksikon setiap bahasa
+
+    Returns:
+        Dictionary dengan 'words' (jumlah kata) dan 'rates' (language -> rasio 0-1)
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    rates = {}
+    for language in languages:
+        lexicon = LEXICONS.get(language)
+        if lexicon is None:
+            continue
+        hits = sum(1 for word in words if word in lexicon)
+        rates[language] = hits / len(words) if words else 0.0
+    return {'words': len(words), 'rates': rates}
+
+
+def choose_languages(text: str, available: Optional[Iterable[str]] = None,
+                     min_words: int = 8, min_rate: float = 0.08, secondary_ratio: float = 0.3) -> Dict:
+    """
+    Pilih set language minimal dari teks sampel
+
+    Bahasa dengan hit rate tertinggi jadi primary. Bahasa kedua ikut dipakai
+    hanya jika hit rate-nya cukup besar dibanding primary (dokumen campuran).
+    Jika sampel terlalu sedikit atau tidak ada leksikon yang cocok, dipakai
+    DEFAULT_LANGUAGES.
+
+    Returns:
+        Dictionary dengan 'language' (mis. 'ind' atau 'ind+eng'), 'method'
+        ('lexicon' atau 'fallback'), 'words' dan 'rates'
+    """
+    candidates = [language for language in LEXICONS if available is None or language in available]
+    stats = lexicon_hit_rates(text, candidates)
+    ranked = sorted(stats['rates'].items(), key=lambda item: item[1], reverse=True)
+
+    if stats['words'] < min_words or not ranked or ranked[0][1] < min_rate:
+        return {'language': fallback_languages(available), 'method': 'fallback', **stats}
+
+    primary, primary_rate = ranked[0]
+    chosen = [primary]
+    for language, rate in ranked[1:]:
+        if rate >= min_rate and rate >= primary_rate * secondary_ratio:
+            chosen.append(language)
+
+    return {'language': '+'.join(chosen), 'method': 'lexicon', **stats}
+
+
+def sample_image(image_path: str, max_width: int = 600, band: float = 0.25) -> bytes:
+    """
+    Sampel kecil untuk deteksi: pita horizontal di tengah gambar (beberapa baris
+    teks), grayscale, diperkecil ke lebar maksimum max_width, sebagai PNG bytes
+
+    JPEG di-decode langsung pada skala kecil (draft) dan PNG disimpan dengan
+    kompresi minimal, sehingga biaya Python per gambar jauh di bawah biaya OCR.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        # Decode JPEG pada skala 1/2, 1/4 atau 1/8 yang masih >= max_width
+        image.draft('L', (max_width, max(1, image.height * max_width // max(1, image.width))))
+        width, height = image.size
+        top = int(height * (1 - band) / 2)
+        sample = image.crop((0, top, width, top + max(1, int(height * band)))).convert('L')
+    if width > max_width:
+        sample = sample.resize((max_width, max(1, int(sample.height * max_width / width))))
+    buffer = io.BytesIO()
+    sample.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def detect_language(image_path: str, available: Optional[Iterable[str]] = None,
+                    profiler=None) -> Dict:
+    """
+    Deteksi language pack untuk satu gambar
+
+    Sampel di-OCR dengan satu model saja (eng, karena ind dan eng sama-sama
+    aksara Latin) lalu dinilai dengan leksikon. Gagal membuat sampel (mis.
+    Pillow tidak terinstall) berarti fallback ke DEFAULT_LANGUAGES yang terinstall.
+    Wall time subprocess tesseract dicatat ke profiler (PipelineProfiler) jika ada.
+    """
+    from models.ocr_model import run_tesseract
+
+    available = tuple(available) if available else None
+    fallback = {'language': fallback_languages(available), 'method': 'fallback', 'words': 0, 'rates': {}}
+    if available is not None and 'eng' not in available:
+        return fallback
+
+    try:
+        sample = sample_image(image_path)
+    except Exception:
+        return fallback
+
+    start = time.perf_counter()
+    text = run_tesseract(sample, 6, languages='eng', thread_limit=1)
+    if profiler:
+        profiler.record_subprocess(time.perf_counter() - start)
+    return choose_languages(text, available)
+
+
+@lru_cache(maxsize=256)
+def folder_language(directory: str) -> Optional[str]:
+    """Override language dari file .ocr.json di folder gambar (di-cache per folder)"""
+    try:
+        with open(os.path.join(directory or '.', FOLDER_CONFIG_FILE), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+    language = config.get('language') if isinstance(config, dict) else None
+    return language or None
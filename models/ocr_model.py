@@ -7,12 +7,225 @@ Menangani data processing, API calls, dan business logic
 import os
 import subprocess
 import re
-import requests
 import json
 import glob
+import io
+import threading
 import time
-from typing import Dict, List, Optional
-from dotenv import load_dotenv
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.form_templates import pixel_box
+from models.hedging import DeadlineExceeded, HedgeBudget, LatencyTracker, remaining_seconds
+from models.language import DEFAULT_LANGUAGES
+from models.preprocessing import PREPROCESS_METHODS, preprocess_image
+from models.prompts import render_prompt, resolve_template
+from models.text_edits import apply_edits
+from models.tuning import resolve_worker_config
+
+# Timeout maksimum satu request Gemini (detik), dipersempit oleh deadline caller
+GEMINI_TIMEOUT = 30
+
+# Modul berat (requests, dotenv) di-import secara lazy supaya cold start
+# `python main.py ...` tidak membayar biaya import yang belum tentu dipakai
+_dotenv_loaded = False
+
+SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif', '.webp'}
+
+# PSM yang dicoba auto_detect_psm(), urut dari yang paling sering dipilih
+AUTO_DETECT_PSM_MODES = (6, 3, 11, 4, 5, 12, 7, 8)
+
+
+def load_env_once():
+    """Load file .env sekali per proses"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+PSM_INFO = {
+    0: {'name': 'OSD only', 'use_case': 'Deteksi orientasi dan script saja'},
+    1: {'name': 'Automatic page segmentation with OSD', 'use_case': 'Segmentasi halaman otomatis dengan OSD'},
+    2: {'name': 'Automatic page segmentation', 'use_case': 'Segmentasi halaman otomatis tanpa OSD'},
+    3: {'name': 'Fully automatic', 'use_case': 'Default Tesseract - cocok untuk dokumen umum'},
+    4: {'name': 'Single column', 'use_case': 'Kolom teks tunggal dengan ukuran bervariasi'},
+    5: {'name': 'Single block', 'use_case': 'Blok teks tunggal yang seragam'},
+    6: {'name': 'Single uniform block', 'use_case': 'Recommended - Dokumen terstruktur (laporan, form)'},
+    7: {'name': 'Single text line', 'use_case': 'Baris teks tunggal (header, caption)'},
+    8: {'name': 'Single word', 'use_case': 'Kata tunggal (logo, label)'},
+    9: {'name': 'Single word in circle', 'use_case': 'Kata dalam lingkaran (stempel, logo)'},
+    10: {'name': 'Single character', 'use_case': 'Karakter tunggal (captcha, angka)'},
+    11: {'name': 'Sparse text', 'use_case': 'Teks tersebar - tangkap sebanyak mungkin kata'},
+    12: {'name': 'Sparse text with OSD', 'use_case': 'Teks tersebar dengan deteksi orientasi'},
+    13: {'name': 'Raw line', 'use_case': 'Baris mentah tanpa processing tambahan'}
+}
+
+
+# Response schema untuk mode koreksi 'diff' (Gemini JSON response mode)
+DIFF_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "edits": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "offset": {"type": "INTEGER"},
+                    "original": {"type": "STRING"},
+                    "replacement": {"type": "STRING"},
+                    "reason": {"type": "STRING"}
+                },
+                "required": ["offset", "original", "replacement"]
+            }
+        },
+        "confidence": {"type": "INTEGER"}
+    },
+    "required": ["edits"]
+}
+
+
+def _fields_response_schema(names: List[str]) -> Dict:
+    """Response schema koreksi field form: object dengan key = nama field"""
+    return {
+        "type": "OBJECT",
+        "properties": {
+            "fields": {
+                "type": "OBJECT",
+                "properties": {name: {"type": "STRING"} for name in names},
+                "required": names
+            },
+            "confidence": {"type": "INTEGER"}
+        },
+        "required": ["fields"]
+    }
+
+
+def _extract_json(generated_text: str) -> Dict:
+    """Parse JSON dari respon Gemini, toleran terhadap code fence dan teks pembungkus"""
+    json_text = generated_text.strip()
+    
+    try:
+        return json.loads(json_text)
+    except ValueError:
+        pass
+    
+    # Ambil objek JSON terluar (mis. dibungkus ```json ... ``` atau kalimat pembuka)
+    start = json_text.find('{')
+    end = json_text.rfind('}')
+    if start == -1 or end <= start:
+        raise ValueError("Respon Gemini tidak berisi JSON")
+    return json.loads(json_text[start:end + 1])
+
+
+def _build_usage(usage_metadata: Dict, template_name: str, start: float) -> Dict:
+    """Ringkas usageMetadata Gemini menjadi accounting token dan latency per call"""
+    return {
+        'prompt_tokens': usage_metadata.get('promptTokenCount', 0),
+        'output_tokens': usage_metadata.get('candidatesTokenCount', 0),
+        'cached_tokens': usage_metadata.get('cachedContentTokenCount', 0),
+        'total_tokens': usage_metadata.get('totalTokenCount', 0),
+        'latency_ms': (time.perf_counter() - start) * 1000,
+        'prompt_template': template_name
+    }
+
+
+def post_process_text(text: str) -> str:
+    """Post-process text for cleanup"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    return '\n'.join(lines)
+
+
+def find_image_files(directory: str = "gambar", formats=SUPPORTED_FORMATS) -> List[str]:
+    """Find all image files in directory (tanpa perlu API key)"""
+    if not os.path.exists(directory):
+        return []
+    
+    image_files = set()
+    for ext in formats:
+        pattern = os.path.join(directory, f"*{ext}")
+        image_files.update(glob.glob(pattern))
+        pattern = os.path.join(directory, f"*{ext.upper()}")
+        image_files.update(glob.glob(pattern))
+    
+    return sorted(list(image_files))
+
+
+def run_tesseract(image, psm_mode: int = 6, languages: str = DEFAULT_LANGUAGES,
+                  thread_limit: Optional[int] = None, whitelist: Optional[str] = None) -> str:
+    """
+    Jalankan tesseract untuk satu gambar
+    
+    Args:
+        image: Path file gambar, atau bytes gambar (dikirim lewat stdin)
+        thread_limit: OMP_THREAD_LIMIT untuk proses tesseract, supaya beberapa
+            proses paralel tidak membuat CPU oversubscribed
+        whitelist: Optional daftar karakter yang boleh dikenali
+    
+    Returns:
+        Teks hasil OCR, string kosong jika gagal
+    """
+    from_stdin = isinstance(image, bytes)
+    cmd = [
+        'tesseract', 'stdin' if from_stdin else image, 'stdout',
+        '--oem', '3', '--psm', str(psm_mode),
+        '-l', languages
+    ]
+    if whitelist:
+        cmd += ['-c', f'tessedit_char_whitelist={whitelist}']
+    env = dict(os.environ, OMP_THREAD_LIMIT=str(thread_limit)) if thread_limit else None
+    
+    try:
+        result = subprocess.run(cmd, input=image if from_stdin else None,
+                                capture_output=True, env=env)
+    except Exception:
+        return ""
+    
+    if result.returncode == 0:
+        return result.stdout.decode('utf-8', errors='replace').strip()
+    return ""
+
+
+@lru_cache(maxsize=1)
+def probe_tesseract() -> Dict:
+    """
+    Probe kemampuan Tesseract sekali per proses
+    
+    Returns:
+        Dictionary dengan 'available', 'version' dan 'languages' (tuple).
+        Hasil di-cache, jadi jangan dimodifikasi oleh caller.
+    """
+    info = {'available': False, 'version': None, 'languages': ()}
+    
+    try:
+        result = subprocess.run(['tesseract', '--version'],
+                                capture_output=True, text=True)
+    except (FileNotFoundError, OSError):
+        return info
+    
+    if result.returncode != 0:
+        return info
+    
+    # Versi lama Tesseract menulis informasi versi ke stderr
+    output = (result.stdout or result.stderr).strip()
+    first_line = output.splitlines()[0] if output else ''
+    info['available'] = True
+    info['version'] = first_line.replace('tesseract', '', 1).strip() or None
+    
+    try:
+        langs = subprocess.run(['tesseract', '--list-langs'],
+                               capture_output=True, text=True)
+        lines = (langs.stdout or langs.stderr).splitlines()
+        # Baris pertama adalah header "List of available languages ..."
+        info['languages'] = tuple(line.strip() for line in lines[1:] if line.strip())
+    except (FileNotFoundError, OSError):
+        pass
+    
+    return info
 
 
 class OCRModel:
@@ -20,141 +233,371 @@ class OCRModel:
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize OCR Model dengan API key"""
-        load_dotenv()
+        load_env_once()
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         
         if not self.api_key:
             raise ValueError("❌ API key tidak ditemukan! Pastikan GEMINI_API_KEY ada di file .env")
         
         self.gemini_endpoint = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
-        self.supported_formats = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif', '.webp'}
+        self.supported_formats = SUPPORTED_FORMATS
+        self.correction_mode = os.getenv('GEMINI_CORRECTION_MODE', 'full')
+        self.prompt_template = os.getenv('GEMINI_PROMPT_TEMPLATE') or None
+        self.cached_content = os.getenv('GEMINI_CACHED_CONTENT') or None
+        
+        if self.prompt_template:
+            # Validasi lebih awal supaya salah konfigurasi tidak tersamar sebagai API failure
+            if resolve_template(self.prompt_template)[1]['mode'] == 'fields':
+                raise ValueError(f"Prompt template {self.prompt_template} khusus untuk field form")
+        
+        if self.cached_content:
+            # Cached content berisi system instruction satu template, hanya dipakai untuk template itu
+            if not self.prompt_template:
+                raise ValueError("GEMINI_CACHED_CONTENT membutuhkan GEMINI_PROMPT_TEMPLATE "
+                                 "(template yang instruksinya ada di cached content)")
+            if resolve_template(self.prompt_template)[1]['system'] is None:
+                raise ValueError(f"Prompt template {self.prompt_template} tidak punya system instruction "
+                                 "untuk di-cache")
+        
+        # Hedged request: kirim duplikat jika request pertama melewati p95
+        self.latency_tracker = LatencyTracker()
+        self.hedge_budget = HedgeBudget(float(os.getenv('GEMINI_HEDGE_RATIO', '0')))
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        
+        # Optional PipelineProfiler untuk mencatat wall time subprocess Tesseract
+        self.profiler = None
+        
+        # OMP_THREAD_LIMIT per proses tesseract (profil tuning, lihat models.tuning)
+        self.tesseract_threads = resolve_worker_config()['threads_per_process']
+        
+        # Preprocessing gambar sebelum Tesseract (pilih lewat python main.py sweep)
+        self.preprocess = os.getenv('OCR_PREPROCESS', 'none')
+        if self.preprocess not in PREPROCESS_METHODS:
+            raise ValueError(f"OCR_PREPROCESS tidak dikenal: {self.preprocess} "
+                             f"(pilih: {', '.join(PREPROCESS_METHODS)})")
     
     def check_tesseract(self) -> bool:
-        """Check if Tesseract is available"""
-        try:
-            result = subprocess.run(['tesseract', '--version'], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except FileNotFoundError:
-            return False
+        """Check if Tesseract is available (memoized per proses)"""
+        return probe_tesseract()['available']
+    
+    def get_tesseract_info(self) -> Dict:
+        """Get versi dan bahasa Tesseract yang tersedia (memoized per proses)"""
+        return probe_tesseract()
     
     def find_image_files(self, directory: str = "gambar") -> List[str]:
         """Find all image files in directory"""
-        if not os.path.exists(directory):
-            return []
+        return find_image_files(directory, self.supported_formats)
+    
+    def extract_text_tesseract(self, image_path: str, psm_mode: int = 6, language: Optional[str] = None,
+                               preprocess: Optional[str] = None) -> str:
+        """
+        Extract text using Tesseract OCR
+        
+        Args:
+            language: Language pack Tesseract (default: ind+eng)
+            preprocess: Metode preprocessing (lihat models.preprocessing,
+                default dari OCR_PREPROCESS)
+        """
+        preprocess = preprocess or self.preprocess
+        start = time.perf_counter()
+        image = image_path if preprocess == 'none' else preprocess_image(image_path, preprocess)
+        text = run_tesseract(image, psm_mode, languages=language or DEFAULT_LANGUAGES,
+                             thread_limit=self.tesseract_threads)
+        if self.profiler:
+            self.profiler.record_subprocess(time.perf_counter() - start)
+        return text
+    
+    def extract_fields_tesseract(self, image_path: str, form_template: Dict,
+                                 language: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract field form: OCR hanya crop region field
+        
+        Crop dikirim ke tesseract lewat stdin dengan PSM dan whitelist per field.
+        Setiap crop memakai satu thread dan jumlah crop paralel dibatasi
+        OMP_THREAD_LIMIT satu slot (tesseract_threads), sehingga pemakaian CPU
+        sama dengan satu proses tesseract full-page. Tanpa profil tuning
+        multi-thread (default 1 thread per proses) crop di-OCR berurutan.
+        
+        Args:
+            image_path: Path ke file gambar
+            form_template: Template dari models.form_templates.load_form_template()
+            language: Language pack Tesseract (default: ind+eng)
+        
+        Returns:
+            Dictionary nama field -> teks mentah (urutan sesuai template)
+        """
+        from PIL import Image
         
-        image_files = set()
-        for ext in self.supported_formats:
-            pattern = os.path.join(directory, f"*{ext}")
-            image_files.update(glob.glob(pattern))
-            pattern = os.path.join(directory, f"*{ext.upper()}")
-            image_files.update(glob.glob(pattern))
+        fields = form_template['fields']
+        crops = []
+        with Image.open(image_path) as image:
+            image.load()
+            for field in fields:
+                buffer = io.BytesIO()
+                image.crop(pixel_box(image.size, field['box'])).save(buffer, format='PNG')
+                crops.append(buffer.getvalue())
         
-        return sorted(list(image_files))
+        def ocr_field(index: int) -> str:
+            field = fields[index]
+            return run_tesseract(crops[index], field['psm'], languages=language or DEFAULT_LANGUAGES,
+                                 thread_limit=1, whitelist=field['whitelist'])
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(len(fields), self.tesseract_threads))) as executor:
+            values = list(executor.map(ocr_field, range(len(fields))))
+        if self.profiler:
+            self.profiler.record_subprocess(time.perf_counter() - start)
+        
+        return {field['name']: value for field, value in zip(fields, values)}
     
-    def extract_text_tesseract(self, image_path: str, psm_mode: int = 6) -> str:
-        """Extract text using Tesseract OCR"""
+    def correct_fields_with_gemini(self, fields: Dict[str, str], deadline: Optional[float] = None) -> Dict:
+        """
+        Koreksi typo nilai field form dalam satu request Gemini
+        
+        Field dikirim sebagai JSON object dan Gemini membalas object dengan key
+        yang sama (response schema per template), jadi tidak perlu parsing teks.
+        
+        Args:
+            fields: Dictionary nama field -> teks mentah (hanya field yang perlu dikoreksi)
+            deadline: Batas waktu absolut (time.monotonic()) dari caller
+        
+        Returns:
+            Dictionary hasil koreksi dengan 'fields' (nilai terkoreksi), 'corrections',
+            'confidence', 'method' dan 'usage'
+        """
+        template_name, prompt_template = resolve_template(mode='fields')
+        start = time.perf_counter()
         try:
-            cmd = [
-                'tesseract', image_path, 'stdout',
-                '--oem', '3', '--psm', str(psm_mode),
-                '-l', 'ind+eng'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
+            system, user = render_prompt(prompt_template, json.dumps(fields, ensure_ascii=False))
+            generated_text, usage_metadata = self._generate(system, user, {
+                "maxOutputTokens": 1024,
+                "responseMimeType": "application/json",
+                "responseSchema": _fields_response_schema(list(fields))
+            }, deadline)
+            correction_result = _extract_json(generated_text)
             
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                return ""
+            corrected = correction_result.get('fields') or {}
+            corrected_fields = {
+                name: corrected[name] if isinstance(corrected.get(name), str) else value
+                for name, value in fields.items()
+            }
+            result = {
+                'success': True,
+                'fields': corrected_fields,
+                'corrections': [
+                    {'original': fields[name], 'corrected': value, 'reason': f"field {name}"}
+                    for name, value in corrected_fields.items() if value != fields[name]
+                ],
+                'confidence': correction_result.get('confidence', 5),
+                'method': 'Gemini 2.0 Flash (fields)'
+            }
+            result['usage'] = _build_usage(usage_metadata, template_name, start)
+            return result
+        except DeadlineExceeded:
+            method = 'Original Text (Deadline Exceeded)'
         except Exception:
-            return ""
+            method = 'Original Text (API Failed)'
+        
+        return {
+            'success': False,
+            'fields': dict(fields),
+            'corrections': [],
+            'confidence': 0,
+            'method': method,
+            'usage': _build_usage({}, template_name, start)
+        }
     
-    def correct_typo_with_gemini(self, text: str) -> Dict:
-        """Correct typos using Gemini AI"""
+    def correct_typo_with_gemini(self, text: str, mode: Optional[str] = None,
+                                 deadline: Optional[float] = None, template: Optional[str] = None) -> Dict:
+        """
+        Correct typos using Gemini AI
+        
+        Args:
+            text: Teks OCR mentah
+            mode: 'full' (Gemini mengembalikan seluruh teks terkoreksi) atau
+                'diff' (Gemini hanya mengembalikan edit per span, teks dibangun
+                ulang secara lokal). Default dari GEMINI_CORRECTION_MODE.
+            deadline: Batas waktu absolut (time.monotonic()) dari caller.
+                Timeout request dipersempit ke sisa waktu deadline.
+            template: Nama prompt template (lihat models.prompts.PROMPT_TEMPLATES).
+                Mode koreksi mengikuti template. Default dari GEMINI_PROMPT_TEMPLATE
+                atau template default untuk mode.
+        
+        Returns:
+            Dictionary hasil koreksi, termasuk 'usage' (token dan latency)
+        """
+        if template is None and mode is None:
+            template = self.prompt_template
+        template_name, prompt_template = resolve_template(template, mode or self.correction_mode)
+        cached_content = self.cached_content if template_name == self.prompt_template else None
+        
+        start = time.perf_counter()
         try:
-            prompt = f"""
-Anda adalah ahli koreksi teks yang berpengalaman. Tugas Anda adalah memperbaiki kesalahan OCR (typo) dalam teks berikut, sambil mempertahankan format dan struktur asli.
-
-TEKS OCR YANG PERLU DIKOREKSI:
-{text}
-
-INSTRUKSI KOREKSI:
-1. Perbaiki HANYA kesalahan ejaan/typo yang jelas dan pasti
-2. Gunakan bahasa Indonesia yang benar dan konteks yang sesuai
-3. Pertahankan format, spasi, dan struktur baris asli
-4. Jangan tambahkan atau hapus informasi yang tidak perlu
-5. Fokus pada kesalahan umum OCR: huruf terbalik, spasi berlebih, karakter salah
-6. Pertahankan angka, tanggal, dan format khusus apa adanya
-
-RESPONSE FORMAT:
-Berikan respon dalam format JSON:
-{{
-    "corrected_text": "teks yang sudah dikoreksi",
-    "corrections": [
-        {{"original": "kata asli", "corrected": "kata terkoreksi", "reason": "alasan koreksi"}}
-    ],
-    "confidence": "nilai kepercayaan 1-10"
-}}
-
-Berikan hanya JSON response, tanpa penjelasan tambahan.
-"""
-            
-            headers = {'Content-Type': 'application/json'}
-            payload = {
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-            
-            url = f"{self.gemini_endpoint}?key={self.api_key}"
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    generated_text = result['candidates'][0]['content']['parts'][0]['text']
-                    
-                    json_text = generated_text.strip()
-                    if json_text.startswith('```json'):
-                        json_text = json_text.replace('```json', '').replace('```', '').strip()
-                    
-                    correction_result = json.loads(json_text)
-                    
-                    return {
-                        'success': True,
-                        'corrected_text': correction_result.get('corrected_text', text),
-                        'corrections': correction_result.get('corrections', []),
-                        'confidence': correction_result.get('confidence', 5),
-                        'method': 'Gemini 2.0 Flash'
-                    }
-                    
+            system, user = render_prompt(prompt_template, text)
+            if prompt_template['mode'] == 'diff':
+                result, usage_metadata = self._correct_diff(text, system, user, prompt_template, deadline,
+                                                            cached_content)
+            else:
+                result, usage_metadata = self._correct_full(text, system, user, prompt_template, deadline,
+                                                            cached_content)
+            result['usage'] = _build_usage(usage_metadata, template_name, start)
+            return result
+        except DeadlineExceeded:
+            result = self._handle_api_failure(text, 'Original Text (Deadline Exceeded)')
         except Exception:
-            pass
-            
-        return self._handle_api_failure(text)
+            result = self._handle_api_failure(text)
+        
+        result['usage'] = _build_usage({}, template_name, start)
+        return result
+    
+    def _correct_full(self, text: str, system: Optional[str], user: str, prompt_template: Dict,
+                      deadline: Optional[float] = None,
+                      cached_content: Optional[str] = None) -> Tuple[Dict, Dict]:
+        """Koreksi mode 'full': Gemini mengembalikan corrected_text lengkap"""
+        generation_config = {"maxOutputTokens": 1024}
+        if prompt_template['json_mode']:
+            generation_config["responseMimeType"] = "application/json"
+        
+        generated_text, usage_metadata = self._generate(system, user, generation_config, deadline,
+                                                        cached_content)
+        correction_result = _extract_json(generated_text)
+        
+        return {
+            'success': True,
+            'corrected_text': correction_result.get('corrected_text', text),
+            'corrections': correction_result.get('corrections', []),
+            'edits': [],
+            'confidence': correction_result.get('confidence', 5),
+            'method': 'Gemini 2.0 Flash'
+        }, usage_metadata
+    
+    def _correct_diff(self, text: str, system: Optional[str], user: str, prompt_template: Dict,
+                      deadline: Optional[float] = None,
+                      cached_content: Optional[str] = None) -> Tuple[Dict, Dict]:
+        """Koreksi mode 'diff': Gemini hanya mengembalikan edit per span (JSON mode + schema)"""
+        generated_text, usage_metadata = self._generate(system, user, {
+            "maxOutputTokens": 1024,
+            "responseMimeType": "application/json",
+            "responseSchema": DIFF_RESPONSE_SCHEMA
+        }, deadline, cached_content)
+        correction_result = _extract_json(generated_text)
+        
+        corrected_text, edits = apply_edits(text, correction_result.get('edits', []))
+        
+        return {
+            'success': True,
+            'corrected_text': corrected_text,
+            'corrections': [
+                {'original': edit['original'], 'corrected': edit['replacement'], 'reason': edit['reason']}
+                for edit in edits
+            ],
+            'edits': edits,
+            'confidence': correction_result.get('confidence', 5),
+            'method': 'Gemini 2.0 Flash (diff)'
+        }, usage_metadata
     
-    def _handle_api_failure(self, text: str) -> Dict:
+    def _generate(self, system: Optional[str], user: str, generation_config: Dict,
+                  deadline: Optional[float] = None,
+                  cached_content: Optional[str] = None) -> Tuple[str, Dict]:
+        """
+        Kirim prompt ke Gemini dan return (teks kandidat pertama, usageMetadata)
+        
+        Instruksi statis dikirim sebagai systemInstruction supaya prefix prompt
+        identik antar request (implicit caching). Jika cached_content diberikan
+        (GEMINI_CACHED_CONTENT, hanya untuk GEMINI_PROMPT_TEMPLATE), instruksi
+        diambil dari cached content tersebut dan tidak dikirim ulang.
+        
+        Jika hedging aktif (GEMINI_HEDGE_RATIO > 0) dan request pertama belum
+        selesai setelah p95 latency, request duplikat dikirim dan respon
+        pertama yang berhasil dipakai.
+        """
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": user}]}],
+            "generationConfig": {
+                "temperature": 0.1,
+                "topK": 40,
+                "topP": 0.95,
+                **generation_config
+            }
+        }
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        elif system:
+            payload["systemInstruction"] = {"parts": [{"text": system}]}
+        
+        self.hedge_budget.record_request()
+        hedge_after = self.latency_tracker.percentile(95) if self.hedge_budget.enabled else None
+        
+        if hedge_after is None:
+            return self._post_gemini(payload, deadline)
+        
+        executor = self._get_hedge_executor()
+        futures = [executor.submit(self._post_gemini, payload, deadline)]
+        
+        remaining = remaining_seconds(deadline)
+        done, _ = wait(futures, timeout=hedge_after if remaining is None else min(hedge_after, remaining))
+        
+        if not done and self.hedge_budget.try_acquire():
+            futures.append(executor.submit(self._post_gemini, payload, deadline))
+        
+        # Respon pertama yang berhasil menang; error hanya dilempar jika semua gagal
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+        raise error
+    
+    def _post_gemini(self, payload: Dict, deadline: Optional[float] = None) -> Tuple[str, Dict]:
+        """Satu request HTTP ke Gemini dengan timeout sesuai sisa deadline"""
+        import requests
+        
+        remaining = remaining_seconds(deadline)
+        timeout = GEMINI_TIMEOUT if remaining is None else min(GEMINI_TIMEOUT, remaining)
+        
+        headers = {'Content-Type': 'application/json'}
+        url = f"{self.gemini_endpoint}?key={self.api_key}"
+        
+        start = time.perf_counter()
+        try:
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        except requests.Timeout:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded("Deadline terlewati saat menunggu Gemini")
+            raise
+        response.raise_for_status()
+        self.latency_tracker.record(time.perf_counter() - start)
+        
+        result = response.json()
+        generated_text = result['candidates'][0]['content']['parts'][0]['text']
+        return generated_text, result.get('usageMetadata', {})
+    
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Thread pool untuk request Gemini yang di-hedge (dibuat saat pertama dipakai)"""
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='gemini-hedge')
+            return self._hedge_executor
+    
+    def _handle_api_failure(self, text: str, method: str = 'Original Text (API Failed)') -> Dict:
         """Handle API failure gracefully"""
         return {
             'success': False,
             'corrected_text': text,
             'corrections': [],
+            'edits': [],
             'confidence': 0,
-            'method': 'Original Text (API Failed)'
+            'method': method
         }
     
     def post_process_text(self, text: str) -> str:
         """Post-process text for cleanup"""
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n', text)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        return '\n'.join(lines)
+        return post_process_text(text)
     
     def calculate_text_quality(self, text: str) -> float:
         """Calculate text quality score (0-10)"""
@@ -202,14 +645,21 @@ Berikan hanya JSON response, tanpa penjelasan tambahan.
         
         return min(score, 10)
     
-    def auto_detect_psm(self, image_path: str) -> Dict:
-        """Automatic PSM detection by testing multiple modes"""
-        test_modes = [3, 4, 5, 6, 7, 8, 11, 12]
+    def auto_detect_psm(self, image_path: str, extract: Optional[Callable[[int], str]] = None) -> Dict:
+        """
+        Automatic PSM detection by testing multiple modes
+        
+        Args:
+            image_path: Path gambar
+            extract: Fungsi psm -> teks OCR (default: extract_text_tesseract),
+                mis. untuk memakai hasil probing spekulatif
+        """
+        extract = extract or (lambda psm: self.extract_text_tesseract(image_path, psm))
         results = {}
         
-        for psm in test_modes:
+        for psm in sorted(AUTO_DETECT_PSM_MODES):
             try:
-                text = self.extract_text_tesseract(image_path, psm)
+                text = extract(psm)
                 
                 if text:
                     word_count = len(text.split())
@@ -256,22 +706,7 @@ Berikan hanya JSON response, tanpa penjelasan tambahan.
     
     def get_psm_info(self) -> Dict:
         """Get PSM mode information"""
-        return {
-            0: {'name': 'OSD only', 'use_case': 'Deteksi orientasi dan script saja'},
-            1: {'name': 'Automatic page segmentation with OSD', 'use_case': 'Segmentasi halaman otomatis dengan OSD'},
-            2: {'name': 'Automatic page segmentation', 'use_case': 'Segmentasi halaman otomatis tanpa OSD'},
-            3: {'name': 'Fully automatic', 'use_case': 'Default Tesseract - cocok untuk dokumen umum'},
-            4: {'name': 'Single column', 'use_case': 'Kolom teks tunggal dengan ukuran bervariasi'},
-            5: {'name': 'Single block', 'use_case': 'Blok teks tunggal yang seragam'},
-            6: {'name': 'Single uniform block', 'use_case': 'Recommended - Dokumen terstruktur (laporan, form)'},
-            7: {'name': 'Single text line', 'use_case': 'Baris teks tunggal (header, caption)'},
-            8: {'name': 'Single word', 'use_case': 'Kata tunggal (logo, label)'},
-            9: {'name': 'Single word in circle', 'use_case': 'Kata dalam lingkaran (stempel, logo)'},
-            10: {'name': 'Single character', 'use_case': 'Karakter tunggal (captcha, angka)'},
-            11: {'name': 'Sparse text', 'use_case': 'Teks tersebar - tangkap sebanyak mungkin kata'},
-            12: {'name': 'Sparse text with OSD', 'use_case': 'Teks tersebar dengan deteksi orientasi'},
-            13: {'name': 'Raw line', 'use_case': 'Baris mentah tanpa processing tambahan'}
-        }
+        return PSM_INFO
     
     def save_results(self, result: Dict, output_file: Optional[str] = None) -> str:
         """Save OCR results to file"""
@@ -288,6 +723,7 @@ Berikan hanya JSON response, tanpa penjelasan tambahan.
             f.write(f"File gambar: {result['image_name']}\n")
             f.write(f"Path lengkap: {result['image_path']}\n")
             f.write(f"PSM Mode: {result['psm_mode']} ({result.get('psm_description', 'N/A')})\n")
+            f.write(f"Bahasa OCR: {result.get('language') or DEFAULT_LANGUAGES}\n")
             f.write(f"Metode koreksi: {result['method']}\n")
             f.write(f"Confidence: {result['confidence']}/10\n")
             f.write(f"Tanggal: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
@@ -297,6 +733,12 @@ Berikan hanya JSON response, tanpa penjelasan tambahan.
             f.write(f"Kata final: {result['statistics']['final_words']}\n")
             f.write(f"Jumlah koreksi: {result['statistics']['corrections_count']}\n")
             
+            usage = result.get('usage')
+            if usage:
+                f.write(f"Token Gemini: prompt {usage['prompt_tokens']}, output {usage['output_tokens']}, "
+                        f"cached {usage['cached_tokens']} ({usage['prompt_template']}, "
+                        f"{usage['latency_ms']:.0f} ms)\n")
+            
             if 'warning' in result:
                 f.write(f"⚠️ Warning: {result['warning']}\n")
             f.write("\n")
@@ -319,5 +761,11 @@ Berikan hanya JSON response, tanpa penjelasan tambahan.
             f.write("TEKS FINAL (POST-PROCESSED):\n")
             f.write("-" * 40 + "\n")
             f.write(result['final_text'] + "\n")
+            
+            fields = result.get('fields')
+            if fields:
+                f.write(f"\nFIELD FORM ({result.get('form_template', 'N/A')}):\n")
+                f.write("-" * 40 + "\n")
+                f.write(json.dumps(fields, ensure_ascii=False, indent=2) + "\n")
         
         return output_file
@@ -0,0 +1,235 @@
+# models/ocr_result.py
+"""
+Record hasil OCR yang ringkas (__slots__)
+Teks mentah disimpan sekali beserta edit koreksi; corrected_text, final_text
+dan statistics diturunkan saat diakses. Tetap bisa dibaca seperti dict
+(result['final_text'], result.get(...), 'warning' in result, dict(result))
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+
+from models.ocr_model import post_process_text
+from models.text_edits import apply_edits, diff_edits
+
+# Perkiraan overhead memori satu edit (tuple + int + 3 objek str) dalam byte
+_EDIT_OVERHEAD = 200
+
+
+def _edits_size(edits: List[Dict]) -> int:
+    """Perkiraan ukuran memori list edit dalam byte"""
+    return sum(_EDIT_OVERHEAD + len(edit['original']) + len(edit['replacement']) for edit in edits)
+
+
+class OCRResult(Mapping):
+    """
+    Hasil processing satu gambar dengan accessor yang kompatibel dengan dict
+
+    Mapping read-only plus __setitem__ untuk field non-turunan. Bukan dict:
+    json.dumps() dan dict.update()/copy() butuh to_dict(). Setiap akses
+    final_text/statistics menghitung ulang apply_edits + post_process_text,
+    jadi untuk save/summary ambil satu snapshot to_dict().
+    """
+
+    __slots__ = (
+        'image_path', 'image_name', 'psm_mode', 'psm_description', 'language',
+        'raw_text', 'edits', '_corrections', 'confidence', 'method',
+        'usage', 'warning', 'output_file', 'extras'
+    )
+
+    # Key yang diturunkan dari raw_text + edits, bukan disimpan. Edit sendiri
+    # (result.edits) bukan bagian dari tampilan dict: pada fallback satu edit
+    # penuh isinya salinan raw_text dan corrected_text
+    _DERIVED_KEYS = ('corrected_text', 'final_text', 'corrections', 'statistics')
+
+    _KEY_ORDER = (
+        'image_path', 'image_name', 'psm_mode', 'psm_description', 'language',
+        'raw_text', 'corrected_text', 'final_text', 'corrections',
+        'confidence', 'method', 'usage', 'statistics', 'warning', 'output_file'
+    )
+
+    def __init__(self, image_path: str, image_name: str, psm_mode: int, psm_description: str,
+                 raw_text: str, edits: List[Dict], corrections: Optional[List[Dict]] = None,
+                 confidence=0, method: str = '', usage: Optional[Dict] = None,
+                 warning: Optional[str] = None, language: Optional[str] = None):
+        self.image_path = image_path
+        self.image_name = image_name
+        self.psm_mode = psm_mode
+        self.psm_description = psm_description
+        self.language = language
+        self.raw_text = raw_text
+        # Edit disimpan sebagai tuple (offset, original, replacement, reason)
+        self.edits = tuple(
+            (edit['offset'], sys.intern(edit['original']), sys.intern(edit['replacement']),
+             sys.intern(edit.get('reason', '')))
+            for edit in edits
+        )
+        # Daftar koreksi hanya disimpan jika berbeda dari edit (mode 'full' dengan alasan dari Gemini)
+        self._corrections = corrections
+        self.confidence = confidence
+        self.method = method
+        self.usage = usage
+        self.warning = warning
+        self.output_file = None
+        self.extras = None
+
+    @classmethod
+    def from_correction(cls, image_path: str, image_name: str, psm_mode: int, psm_description: str,
+                        raw_text: str, correction_result: Dict, language: Optional[str] = None) -> 'OCRResult':
+        """
+        Buat record dari hasil correct_typo_with_gemini()
+
+        Mode 'diff' sudah membawa edit; mode 'full' diubah menjadi edit lewat diff
+        terhadap raw_text supaya teks terkoreksi tidak disimpan sebagai salinan kedua.
+        """
+        corrected_text = correction_result['corrected_text']
+        edits = correction_result.get('edits') or []
+        corrections = None
+
+        if not edits and corrected_text != raw_text:
+            edits = diff_edits(raw_text, corrected_text)
+            corrections = correction_result['corrections']
+        elif not edits:
+            corrections = correction_result['corrections'] or None
+
+        # Simpan sebagai satu edit penuh jika edit tidak merekonstruksi teks yang sama,
+        # atau jika edit yang sangat rapat justru lebih boros daripada salinan teks
+        if (apply_edits(raw_text, edits)[0] != corrected_text
+                or _edits_size(edits) > len(corrected_text)):
+            edits = [{'offset': 0, 'original': raw_text, 'replacement': corrected_text, 'reason': ''}]
+            corrections = correction_result['corrections']
+
+        warning = None
+        if not correction_result['success']:
+            warning = 'Gemini API tidak tersedia, menggunakan teks original'
+
+        return cls(
+            image_path, image_name, psm_mode, psm_description, raw_text, edits,
+            corrections=corrections,
+            confidence=correction_result['confidence'],
+            method=correction_result['method'],
+            usage=correction_result.get('usage'),
+            warning=warning,
+            language=language
+        )
+
+    # Derived values -----------------------------------------------------
+
+    @property
+    def corrected_text(self) -> Optional[str]:
+        if self.raw_text is None:
+            return None
+        if not self.edits:
+            return self.raw_text
+        return apply_edits(self.raw_text, self._edit_dicts())[0]
+
+    @property
+    def final_text(self) -> Optional[str]:
+        return self._texts()[1]
+
+    def _texts(self):
+        """(corrected_text, final_text) dengan satu kali apply_edits + post_process_text"""
+        corrected = self.corrected_text
+        return corrected, None if corrected is None else post_process_text(corrected)
+
+    @property
+    def corrections(self) -> List[Dict]:
+        if self._corrections is not None:
+            return self._corrections
+        return [
+            {'original': original, 'corrected': replacement, 'reason': reason}
+            for _, original, replacement, reason in self.edits
+        ]
+
+    @property
+    def statistics(self) -> Dict:
+        return self._statistics(self.final_text)
+
+    def _statistics(self, final_text: Optional[str]) -> Dict:
+        return {
+            'raw_words': len(self.raw_text.split()) if self.raw_text else 0,
+            'final_words': len(final_text.split()) if final_text else 0,
+            'corrections_count': len(self.corrections)
+        }
+
+    @property
+    def cache_key(self) -> tuple:
+        """Key cache hasil OCR: gambar, PSM dan language pack yang dipakai"""
+        return (self.image_path, self.psm_mode, self.language)
+
+    def _edit_dicts(self) -> List[Dict]:
+        return [
+            {'offset': offset, 'original': original, 'replacement': replacement, 'reason': reason}
+            for offset, original, replacement, reason in self.edits
+        ]
+
+    def drop_texts(self):
+        """Buang teks (mis. setelah disimpan ke file) untuk menghemat memori"""
+        self.raw_text = None
+        self.edits = ()
+
+    # Dict-compatible accessor -------------------------------------------
+
+    def __getitem__(self, key: str):
+        if key in self.__slots__ or key in self._DERIVED_KEYS:
+            if key not in self:
+                raise KeyError(key)
+            return getattr(self, key)
+        if self.extras and key in self.extras:
+            return self.extras[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in self.__slots__ and not key.startswith('_') and key not in ('extras', 'edits'):
+            setattr(self, key, value)
+        elif key in self._DERIVED_KEYS:
+            raise KeyError(f"'{key}' diturunkan dari raw_text dan edits, tidak bisa di-set")
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+
+    def __contains__(self, key) -> bool:
+        if key in ('warning', 'output_file', 'usage', 'language'):
+            return getattr(self, key) is not None
+        if key in ('raw_text', 'corrected_text', 'final_text'):
+            return self.raw_text is not None
+        if key in self._KEY_ORDER:
+            return True
+        return bool(self.extras) and key in self.extras
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        keys = [key for key in self._KEY_ORDER if key in self]
+        if self.extras:
+            keys.extend(self.extras)
+        return keys
+
+    def items(self) -> Iterator:
+        return ((key, self[key]) for key in self.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def to_dict(self) -> Dict:
+        """Salinan dict penuh; teks turunan dihitung sekali untuk seluruh snapshot"""
+        corrected_text, final_text = self._texts()
+        derived = {
+            'corrected_text': corrected_text,
+            'final_text': final_text,
+            'corrections': self.corrections,
+            'statistics': self._statistics(final_text)
+        }
+        return {key: derived[key] if key in derived else self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"OCRResult(image_name={self.image_name!r}, psm_mode={self.psm_mode}, method={self.method!r})"
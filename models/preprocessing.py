@@ -0,0 +1,69 @@
+# models/preprocessing.py
+"""
+Preprocessing gambar sebelum Tesseract
+Hasil preprocessing dikirim ke tesseract lewat stdin (PNG bytes), tanpa file sementara
+"""
+
+import io
+from typing import List
+
+PREPROCESS_METHODS = ('none', 'grayscale', 'binarize', 'upscale')
+
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """Threshold Otsu dari histogram grayscale 256 bin"""
+    total = sum(histogram)
+    if not total:
+        return 128
+    sum_all = sum(index * count for index, count in enumerate(histogram))
+
+    best_threshold, best_variance = 128, -1.0
+    weight_background = 0
+    sum_background = 0
+    for threshold, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += threshold * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    return best_threshold
+
+
+def preprocess_image(image_path: str, method: str) -> bytes:
+    """
+    Preprocess gambar dan return PNG bytes untuk tesseract stdin
+
+    Metode:
+        grayscale: konversi ke grayscale
+        binarize: grayscale + autocontrast + threshold Otsu
+        upscale: grayscale diperbesar 2x (teks kecil / resolusi rendah)
+
+    Raises:
+        ValueError: Jika metode tidak dikenal atau 'none'
+    """
+    if method not in PREPROCESS_METHODS or method == 'none':
+        raise ValueError(f"Metode preprocessing tidak dikenal: {method} (pilih: {', '.join(PREPROCESS_METHODS)})")
+
+    from PIL import Image, ImageOps
+
+    with Image.open(image_path) as image:
+        processed = ImageOps.grayscale(image)
+
+    if method == 'binarize':
+        processed = ImageOps.autocontrast(processed)
+        threshold = _otsu_threshold(processed.histogram())
+        processed = processed.point(lambda value: 255 if value > threshold else 0, mode='1')
+    elif method == 'upscale':
+        processed = processed.resize((processed.width * 2, processed.height * 2), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    processed.save(buffer, format='PNG')
+    return buffer.getvalue()
+
@@ -0,0 +1,181 @@
+# models/profiler.py
+"""
+Profiler per stage untuk OCR pipeline
+Mencatat wall time, CPU time Python dan wall time subprocess (Tesseract)
+per stage, lalu menulis file pstats dan collapsed stack untuk flame graph
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+PROFILE_MODES = ('deterministic', 'sampled')
+
+
+class PipelineProfiler:
+    """
+    Profiler untuk stage pipeline (extract_text_tesseract, correct_typo_with_gemini, ...)
+
+    Mode 'deterministic' memakai cProfile per stage (file .pstats) ditambah
+    sampler stack; jika cProfile tidak bisa di-enable (stage paralel di Python
+    3.12+), eksekusi stage itu hanya diukur sampler. Mode 'sampled' hanya
+    memakai sampler (overhead rendah).
+    Sampler selalu menghasilkan stacks.collapsed (format flamegraph.pl /
+    speedscope), dengan nama stage sebagai frame paling atas.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, mode: str = 'deterministic',
+                 sample_interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode tidak dikenal: {mode} (pilih: {', '.join(PROFILE_MODES)})")
+
+        self.output_dir = output_dir or f"profile_{time.strftime('%Y%m%d_%H%M%S')}"
+        self.mode = mode
+        self.sample_interval = sample_interval
+
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.profiles = {}
+        self.stacks = {}
+        self.active = {}  # thread id -> nama stage
+
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name='pipeline-profiler', daemon=True)
+        self._sampler.start()
+
+    def _stage_stats(self, name: str) -> Dict:
+        return self.stats.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'subprocess': 0.0})
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager untuk mengukur satu eksekusi stage di thread saat ini"""
+        thread_id = threading.get_ident()
+        profile = None
+
+        if self.mode == 'deterministic':
+            # cProfile hanya mengukur thread tempat ia di-enable, jadi satu profile per (stage, thread)
+            with self.lock:
+                profile = self.profiles.setdefault((name, thread_id), cProfile.Profile())
+
+        with self.lock:
+            self.active[thread_id] = name
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        enabled = False
+        try:
+            if profile:
+                try:
+                    profile.enable()
+                    enabled = True
+                except ValueError:
+                    # Python 3.12+: cProfile memakai sys.monitoring dengan satu tool id per
+                    # proses, jadi stage paralel tidak bisa di-enable bersamaan; stage ini
+                    # hanya tercatat lewat sampler stack
+                    pass
+            yield
+        finally:
+            if enabled:
+                profile.disable()
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+
+            with self.lock:
+                self.active.pop(thread_id, None)
+                stats = self._stage_stats(name)
+                stats['calls'] += 1
+                stats['wall'] += wall
+                stats['cpu'] += cpu
+
+    def record_subprocess(self, seconds: float):
+        """Catat wall time subprocess untuk stage yang sedang aktif di thread ini"""
+        with self.lock:
+            name = self.active.get(threading.get_ident())
+            if name:
+                self._stage_stats(name)['subprocess'] += seconds
+
+    def _sample_loop(self):
+        """Ambil sampel stack semua thread yang sedang berada di dalam stage"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            with self.lock:
+                active = dict(self.active)
+
+            for thread_id, name in active.items():
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(name)
+                key = ';'.join(reversed(stack))
+
+                with self.lock:
+                    self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def finish(self) -> Dict:
+        """
+        Hentikan sampler dan tulis hasil profiling
+
+        Returns:
+            Dictionary dengan 'output_dir', 'files' dan 'stages' (ringkasan per stage)
+        """
+        self._stop.set()
+        self._sampler.join()
+        os.makedirs(self.output_dir, exist_ok=True)
+        files = []
+
+        with self.lock:
+            by_stage = {}
+            for (name, _), profile in self.profiles.items():
+                by_stage.setdefault(name, []).append(profile)
+
+            for name, profiles in by_stage.items():
+                try:
+                    stats = pstats.Stats(profiles[0])
+                except TypeError:
+                    # Profile tanpa data (stage tidak pernah mengeksekusi kode Python)
+                    continue
+                for profile in profiles[1:]:
+                    try:
+                        stats.add(profile)
+                    except TypeError:
+                        pass
+                path = os.path.join(self.output_dir, f"{name}.pstats")
+                stats.dump_stats(path)
+                files.append(path)
+
+            collapsed_path = os.path.join(self.output_dir, "stacks.collapsed")
+            with open(collapsed_path, 'w', encoding='utf-8') as f:
+                for key, count in sorted(self.stacks.items()):
+                    f.write(f"{key} {count}\n")
+            files.append(collapsed_path)
+
+            stages = {}
+            for name, stats in self.stats.items():
+                stages[name] = {
+                    'calls': stats['calls'],
+                    'wall_s': stats['wall'],
+                    'python_cpu_s': stats['cpu'],
+                    'subprocess_wall_s': stats['subprocess']
+                }
+
+        summary_path = os.path.join(self.output_dir, "summary.txt")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(f"{'stage':<28}{'calls':>7}{'wall_s':>10}{'cpu_s':>10}{'subproc_s':>11}\n")
+            for name, data in stages.items():
+                f.write(f"{name:<28}{data['calls']:>7}{data['wall_s']:>10.3f}"
+                        f"{data['python_cpu_s']:>10.3f}{data['subprocess_wall_s']:>11.3f}\n")
+        files.append(summary_path)
+
+        return {'output_dir': self.output_dir, 'files': files, 'stages': stages}
@@ -0,0 +1,101 @@
+# models/prompts.py
+"""
+Template prompt berversi untuk koreksi typo dengan Gemini
+Instruksi statis dikirim sebagai systemInstruction (prefix yang sama di setiap
+request, bisa di-cache oleh API), teks OCR dikirim sebagai pesan user
+"""
+
+from typing import Dict, Optional, Tuple
+
+# Prompt asli (instruksi dan teks OCR dalam satu pesan), dipertahankan apa adanya
+_FULL_LEGACY_PROMPT = """
+Anda adalah ahli koreksi teks yang berpengalaman. Tugas Anda adalah memperbaiki kesalahan OCR (typo) dalam teks berikut, sambil mempertahankan format dan struktur asli.
+
+TEKS OCR YANG PERLU DIKOREKSI:
+{text}
+
+INSTRUKSI KOREKSI:
+1. Perbaiki HANYA kesalahan ejaan/typo yang jelas dan pasti
+2. Gunakan bahasa Indonesia yang benar dan konteks yang sesuai
+3. Pertahankan format, spasi, dan struktur baris asli
+4. Jangan tambahkan atau hapus informasi yang tidak perlu
+5. Fokus pada kesalahan umum OCR: huruf terbalik, spasi berlebih, karakter salah
+6. Pertahankan angka, tanggal, dan format khusus apa adanya
+
+RESPONSE FORMAT:
+Berikan respon dalam format JSON:
+{{
+    "corrected_text": "teks yang sudah dikoreksi",
+    "corrections": [
+        {{"original": "kata asli", "corrected": "kata terkoreksi", "reason": "alasan koreksi"}}
+    ],
+    "confidence": "nilai kepercayaan 1-10"
+}}
+
+Berikan hanya JSON response, tanpa penjelasan tambahan.
+"""
+
+_FULL_INSTRUCTION = """Anda adalah ahli koreksi teks yang berpengalaman. Perbaiki kesalahan OCR (typo) dalam teks dari user, sambil mempertahankan format dan struktur asli.
+
+INSTRUKSI KOREKSI:
+1. Perbaiki HANYA kesalahan ejaan/typo yang jelas dan pasti
+2. Gunakan bahasa Indonesia yang benar dan konteks yang sesuai
+3. Pertahankan format, spasi, dan struktur baris asli
+4. Jangan tambahkan atau hapus informasi yang tidak perlu
+5. Fokus pada kesalahan umum OCR: huruf terbalik, spasi berlebih, karakter salah
+6. Pertahankan angka, tanggal, dan format khusus apa adanya
+
+Balas hanya dengan JSON:
+{"corrected_text": "...", "corrections": [{"original": "...", "corrected": "...", "reason": "..."}], "confidence": 1-10}"""
+
+_FULL_COMPACT_INSTRUCTION = """Koreksi typo OCR (bahasa Indonesia) pada teks user. Hanya typo yang pasti; pertahankan format, baris, angka, tanggal.
+JSON: {"corrected_text": str, "corrections": [{"original": str, "corrected": str, "reason": str}], "confidence": 1-10}"""
+
+_DIFF_INSTRUCTION = """Anda adalah ahli koreksi teks OCR. Temukan kesalahan OCR (typo) yang jelas dan pasti dalam teks dari user.
+
+INSTRUKSI:
+1. Kembalikan HANYA daftar edit, jangan tulis ulang seluruh teks
+2. Setiap edit: offset (posisi karakter awal di teks OCR, mulai 0), original (teks persis seperti di teks OCR), replacement (teks pengganti), reason (alasan singkat)
+3. Gunakan bahasa Indonesia yang benar dan konteks yang sesuai
+4. Jangan ubah angka, tanggal, format khusus, spasi, dan struktur baris
+5. Jika tidak ada kesalahan, kembalikan daftar edit kosong"""
+
+_DIFF_COMPACT_INSTRUCTION = """Cari typo OCR yang pasti (bahasa Indonesia) di teks user. Balas daftar edit: offset (indeks karakter, mulai 0), original (persis), replacement, reason. Jangan ubah angka/tanggal/spasi. Tanpa typo: edits kosong."""
+
+_FIELDS_INSTRUCTION = """Anda adalah ahli koreksi teks OCR. User mengirim JSON berisi nilai field form hasil OCR (nama field -> teks).
+Perbaiki HANYA kesalahan OCR (typo) yang jelas dan pasti pada setiap nilai, gunakan bahasa Indonesia yang benar dan nama field sebagai konteks.
+Jangan ubah angka, tanggal dan format khusus. Kembalikan semua field dengan nama yang sama di "fields"."""
+
+PROMPT_TEMPLATES = {
+    'full-v1': {'mode': 'full', 'system': None, 'user': _FULL_LEGACY_PROMPT, 'json_mode': False},
+    'full-v2': {'mode': 'full', 'system': _FULL_INSTRUCTION, 'user': '{text}', 'json_mode': True},
+    'full-v2-compact': {'mode': 'full', 'system': _FULL_COMPACT_INSTRUCTION, 'user': '{text}', 'json_mode': True},
+    'diff-v1': {'mode': 'diff', 'system': _DIFF_INSTRUCTION, 'user': 'TEKS OCR:\n{text}', 'json_mode': True},
+    'diff-v1-compact': {'mode': 'diff', 'system': _DIFF_COMPACT_INSTRUCTION, 'user': '{text}', 'json_mode': True},
+    'fields-v1': {'mode': 'fields', 'system': _FIELDS_INSTRUCTION, 'user': '{text}', 'json_mode': True},
+}
+
+# Template default per mode koreksi
+DEFAULT_TEMPLATES = {
+    'full': 'full-v1',
+    'diff': 'diff-v1',
+    'fields': 'fields-v1',
+}
+
+
+def resolve_template(name: Optional[str] = None, mode: str = 'full') -> Tuple[str, Dict]:
+    """
+    Cari template berdasarkan nama, atau template default untuk mode
+
+    Raises:
+        ValueError: Jika nama template tidak dikenal
+    """
+    name = name or DEFAULT_TEMPLATES.get(mode, DEFAULT_TEMPLATES['full'])
+    if name not in PROMPT_TEMPLATES:
+        raise ValueError(f"Prompt template tidak dikenal: {name} (pilih: {', '.join(PROMPT_TEMPLATES)})")
+    return name, PROMPT_TEMPLATES[name]
+
+
+def render_prompt(template: Dict, text: str) -> Tuple[Optional[str], str]:
+    """Return (system instruction, pesan user) untuk teks OCR"""
+    return template['system'], template['user'].format(text=text)
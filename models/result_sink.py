@@ -0,0 +1,51 @@
+# models/result_sink.py
+"""
+Shared result sink untuk distributed OCR processing
+Setiap worker menulis ke file JSONL miliknya sendiri di shared directory,
+sehingga tidak ada dua proses yang append ke file yang sama
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterator
+
+
+class JsonlResultSink:
+    """Tulis hasil OCR sebagai JSON lines ke shared directory"""
+
+    def __init__(self, directory: str = "hasil_ocr"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.output_file = os.path.join(
+            directory, f"results-{socket.gethostname()}-{os.getpid()}.jsonl"
+        )
+        self._lock = threading.Lock()
+
+    def write(self, result: Dict, job_id=None) -> str:
+        """Append satu hasil (dict atau OCRResult) ke file sink, return path file"""
+        record = result.to_dict() if hasattr(result, 'to_dict') else dict(result)
+        record['job_id'] = job_id
+        record['written_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        line = json.dumps(record, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.output_file, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        return self.output_file
+
+    def read_all(self) -> Iterator[Dict]:
+        """Baca semua hasil dari seluruh worker di directory sink"""
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith('results-') and name.endswith('.jsonl')):
+                continue
+            with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
@@ -0,0 +1,201 @@
+# models/scheduler.py
+"""
+Priority scheduler untuk resource OCR pipeline (slot Tesseract dan Gemini)
+Request interaktif mendahului batch besar, dengan reservasi slot per kelas
+dan fair-share antar batch job
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from models.tuning import resolve_worker_config
+
+# Urutan = prioritas (index kecil = prioritas tinggi)
+PRIORITY_CLASSES = ('interactive', 'batch', 'background')
+
+DEFAULT_RESERVATIONS = {
+    'interactive': {'tesseract': 1, 'gemini': 1}
+}
+
+
+class _Waiter:
+    """Satu request yang menunggu slot"""
+
+    __slots__ = ('rank', 'priority', 'job_id', 'enqueued_at', 'event')
+
+    def __init__(self, priority: str, job_id: Optional[str]):
+        self.rank = PRIORITY_CLASSES.index(priority)
+        self.priority = priority
+        self.job_id = job_id
+        self.enqueued_at = time.perf_counter()
+        self.event = threading.Event()
+
+
+class _ResourcePool:
+    """Pool slot untuk satu resource (mis. 'tesseract') dengan antrian prioritas"""
+
+    def __init__(self, capacity: int, reservations: Dict[str, int]):
+        self.capacity = max(1, capacity)
+        # Minimal satu slot selalu tersisa untuk kelas terendah supaya tidak starvation
+        self.reservations = {name: min(count, self.capacity - 1) for name, count in reservations.items()}
+        self.lock = threading.Lock()
+        self.waiters = []
+        self.in_use_by_class = {name: 0 for name in PRIORITY_CLASSES}
+        self.in_use_by_job = {}
+        self.served_by_job = {}
+        self.stats = {name: {'acquired': 0, 'total_wait': 0.0, 'max_wait': 0.0} for name in PRIORITY_CLASSES}
+
+    def _in_use(self) -> int:
+        return sum(self.in_use_by_class.values())
+
+    def _is_eligible(self, waiter: _Waiter) -> bool:
+        """
+        Kelas boleh ambil slot jika tidak memakai slot yang direservasi kelas lebih
+        tinggi yang sedang menunggu
+
+        Reservasi hanya ditahan selama ada waiter kelas lebih tinggi di antrian;
+        tanpa itu semua slot boleh dipakai (batch saja memakai kapasitas penuh).
+        Request interaktif yang datang belakangan tetap mendapat slot kosong
+        berikutnya lewat _dispatch().
+        """
+        free = self.capacity - self._in_use()
+        waiting = {other.priority for other in self.waiters if other.rank < waiter.rank}
+        reserved_for_higher = sum(
+            max(0, self.reservations.get(name, 0) - self.in_use_by_class[name])
+            for name in PRIORITY_CLASSES[:waiter.rank] if name in waiting
+        )
+        return free > reserved_for_higher
+
+    def _dispatch(self):
+        """Berikan slot kosong ke waiter terbaik (dipanggil dengan lock dipegang)"""
+        while self.waiters:
+            eligible = [waiter for waiter in self.waiters if self._is_eligible(waiter)]
+            if not eligible:
+                return
+
+            # Prioritas kelas dulu, lalu fair-share (job dengan slot aktif dan jatah
+            # terlayani paling sedikit), lalu FIFO
+            waiter = min(eligible, key=lambda w: (
+                w.rank, self.in_use_by_job.get(w.job_id, 0),
+                self.served_by_job.get(w.job_id, 0), w.enqueued_at
+            ))
+            self.waiters.remove(waiter)
+            self.in_use_by_class[waiter.priority] += 1
+            self.in_use_by_job[waiter.job_id] = self.in_use_by_job.get(waiter.job_id, 0) + 1
+            self.served_by_job[waiter.job_id] = self.served_by_job.get(waiter.job_id, 0) + 1
+
+            wait = time.perf_counter() - waiter.enqueued_at
+            stats = self.stats[waiter.priority]
+            stats['acquired'] += 1
+            stats['total_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+
+            waiter.event.set()
+
+    def acquire(self, priority: str, job_id: Optional[str]) -> _Waiter:
+        waiter = _Waiter(priority, job_id)
+        with self.lock:
+            self.waiters.append(waiter)
+            self._dispatch()
+        waiter.event.wait()
+        return waiter
+
+    def release(self, waiter: _Waiter):
+        with self.lock:
+            self.in_use_by_class[waiter.priority] -= 1
+            remaining = self.in_use_by_job.get(waiter.job_id, 1) - 1
+            if remaining > 0:
+                self.in_use_by_job[waiter.job_id] = remaining
+            else:
+                self.in_use_by_job.pop(waiter.job_id, None)
+                # Job yang sudah tidak aktif tidak perlu dihitung lagi untuk fair-share
+                if not any(other.job_id == waiter.job_id for other in self.waiters):
+                    self.served_by_job.pop(waiter.job_id, None)
+            self._dispatch()
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            result = {}
+            for name in PRIORITY_CLASSES:
+                stats = self.stats[name]
+                acquired = stats['acquired']
+                result[name] = {
+                    'queue_depth': sum(1 for waiter in self.waiters if waiter.priority == name),
+                    'in_flight': self.in_use_by_class[name],
+                    'acquired': acquired,
+                    'avg_wait_ms': (stats['total_wait'] / acquired * 1000) if acquired else 0.0,
+                    'max_wait_ms': stats['max_wait'] * 1000
+                }
+            return result
+
+
+class PriorityScheduler:
+    """
+    Scheduler slot resource dengan kelas prioritas
+
+    Kelas: 'interactive' > 'batch' > 'background'. Selama kelas lebih tinggi
+    menunggu, slot yang direservasi untuknya tidak dipakai kelas di bawahnya,
+    sehingga request interaktif selalu mendapat slot berikutnya yang kosong
+    (tunggu paling lama satu OCR). Tanpa waiter kelas lebih tinggi, kelas bawah
+    memakai kapasitas penuh. Antar batch job (job_id berbeda) slot dibagi
+    secara fair-share.
+    """
+
+    def __init__(self, capacities: Optional[Dict[str, int]] = None,
+                 reservations: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Args:
+            capacities: Jumlah slot per resource, mis. {'tesseract': 4, 'gemini': 4}
+            reservations: Slot yang direservasi per kelas per resource
+        """
+        capacities = capacities or self.default_capacities()
+        reservations = DEFAULT_RESERVATIONS if reservations is None else reservations
+
+        self.pools = {}
+        for resource, capacity in capacities.items():
+            per_class = {name: reservations.get(name, {}).get(resource, 0) for name in PRIORITY_CLASSES}
+            self.pools[resource] = _ResourcePool(capacity, per_class)
+
+    @staticmethod
+    def default_capacities() -> Dict[str, int]:
+        """Kapasitas default: slot Tesseract dari profil tuning (atau env/jumlah CPU), Gemini dari env"""
+        return {
+            'tesseract': resolve_worker_config()['processes'],
+            'gemini': int(os.getenv('OCR_GEMINI_CONCURRENCY', '4'))
+        }
+
+    def capacity(self, resource: str) -> int:
+        """Jumlah slot untuk resource (1 jika resource tidak dikelola)"""
+        pool = self.pools.get(resource)
+        return pool.capacity if pool else 1
+
+    @contextmanager
+    def slot(self, resource: str, priority: str = 'batch', job_id: Optional[str] = None):
+        """
+        Context manager untuk memakai satu slot resource
+
+        Args:
+            resource: Nama resource ('tesseract' atau 'gemini')
+            priority: Kelas prioritas (lihat PRIORITY_CLASSES)
+            job_id: ID batch job untuk fair-share (None = request tunggal)
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Priority class tidak dikenal: {priority}")
+
+        pool = self.pools.get(resource)
+        if pool is None:
+            yield
+            return
+
+        waiter = pool.acquire(priority, job_id)
+        try:
+            yield
+        finally:
+            pool.release(waiter)
+
+    def stats(self) -> Dict:
+        """Queue depth, slot aktif dan wait time per resource per kelas"""
+        return {resource: pool.snapshot() for resource, pool in self.pools.items()}
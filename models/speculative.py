@@ -0,0 +1,175 @@
+# models/speculative.py
+"""
+Cache kerja spekulatif untuk mode interaktif
+OCR dan probing PSM dijalankan di background selama user masih membaca menu;
+hasil untuk pilihan user dipakai ulang, sisanya dibatalkan.
+"""
+
+import queue
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Callable, Dict, Hashable, List, Optional
+
+# Task spekulatif yang sedang berjalan di thread ini: (cache, key)
+_current = threading.local()
+
+
+def check_cancelled():
+    """
+    Raise CancelledError jika task spekulatif di thread ini sudah dibatalkan
+    (cache ditutup atau key di-drop lewat cancel()); no-op di luar task spekulatif
+
+    Dipanggil sebelum subprocess Tesseract atau request Gemini, supaya kerja
+    yang sudah tidak dibutuhkan berhenti di langkah berikutnya.
+    """
+    task = getattr(_current, 'task', None)
+    if task is not None:
+        cache, key = task
+        with cache._lock:
+            if cache._closed or key not in cache._futures:
+                raise CancelledError()
+
+
+class _DaemonPool:
+    """
+    Pool thread daemon sederhana
+
+    ThreadPoolExecutor men-join thread-nya saat interpreter exit, sehingga task
+    spekulatif yang masih berjalan (OCR, request Gemini) menahan proses setelah
+    sesi interaktif selesai. Thread daemon tidak ditunggu.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._tasks = queue.SimpleQueue()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"{thread_name_prefix}_{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, function: Callable, *args) -> Future:
+        future = Future()
+        self._tasks.put((future, function, args))
+        return future
+
+    def _worker(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, function, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self):
+        """Hentikan worker setelah task yang sedang berjalan (tanpa menunggu)"""
+        for _ in self._threads:
+            self._tasks.put(None)
+
+
+class SpeculativeCache:
+    """
+    Future per key (mis. ('tesseract', path, psm, language))
+
+    get() memakai hasil yang sudah selesai atau sedang berjalan. Future yang
+    belum mulai dibatalkan dan caller menjalankan pekerjaannya sendiri dengan
+    prioritas interaktif, supaya tidak menunggu di belakang antrian spekulatif.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = _DaemonPool(max(1, max_workers), 'ocr-speculative')
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._filters: List[Callable[[Hashable], bool]] = []
+        self.stats = {'submitted': 0, 'hits': 0, 'cancelled': 0}
+
+    def submit(self, key: Hashable, function: Callable, *args) -> Optional[Future]:
+        """Jadwalkan pekerjaan untuk key (no-op jika key sudah ada, sudah dibatalkan atau cache ditutup)"""
+        with self._lock:
+            if self._closed or not all(keep(key) for keep in self._filters):
+                return None
+            future = self._futures.get(key)
+            if future is None:
+                future = self._executor.submit(self._run, key, function, *args)
+                self._futures[key] = future
+                self.stats['submitted'] += 1
+            return future
+
+    def _run(self, key: Hashable, function: Callable, *args):
+        # Key yang sudah dibatalkan saat masih di antrian tidak perlu dijalankan
+        with self._lock:
+            if self._closed or key not in self._futures:
+                raise CancelledError()
+        _current.task = (self, key)
+        try:
+            return function(*args)
+        finally:
+            _current.task = None
+
+    def put(self, key: Hashable, value):
+        """Simpan hasil yang dihitung di luar cache (mis. deteksi bahasa interaktif)"""
+        future = Future()
+        future.set_result(value)
+        with self._lock:
+            if not self._closed:
+                self._futures[key] = future
+
+    def get(self, key: Hashable, default=None):
+        """
+        Hasil untuk key, menunggu jika sedang berjalan
+
+        Returns:
+            Hasil pekerjaan, atau default jika key tidak ada, belum mulai
+            (langsung dibatalkan), dibatalkan atau gagal
+        """
+        with self._lock:
+            future = self._futures.get(key)
+        if future is None:
+            return default
+
+        if future.cancel():
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                self.stats['cancelled'] += 1
+            return default
+
+        try:
+            value = future.result()
+        except (CancelledError, Exception):
+            return default
+
+        with self._lock:
+            self.stats['hits'] += 1
+        return value
+
+    def cancel(self, keep: Callable[[Hashable], bool]) -> int:
+        """
+        Batalkan semua key yang tidak lolos keep(key) dan tolak submit berikutnya
+        untuk key tersebut; return jumlah yang dibatalkan
+        """
+        with self._lock:
+            self._filters.append(keep)
+            dropped = [key for key in self._futures if not keep(key)]
+            for key in dropped:
+                self._futures.pop(key).cancel()
+            self.stats['cancelled'] += len(dropped)
+        return len(dropped)
+
+    def close(self):
+        """
+        Batalkan semua pekerjaan yang belum mulai; yang sedang berjalan berhenti
+        di check_cancelled() berikutnya dan tidak menahan proses saat exit
+        """
+        with self._lock:
+            self._closed = True
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+        self._executor.shutdown()
@@ -0,0 +1,187 @@
+# models/sweep.py
+"""
+Sweep akurasi vs kecepatan dengan ground truth
+Menjalankan grid setting (PSM, preprocessing, language, Gemini on/off) pada
+gambar yang punya file ground truth `<nama>.gt.txt`, lalu menghitung CER/WER,
+latency dan token Gemini per konfigurasi beserta Pareto front-nya.
+"""
+
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+GROUND_TRUTH_SUFFIX = '.gt.txt'
+
+# Objektif Pareto: semua diminimalkan
+PARETO_KEYS = ('cer', 'seconds_per_image', 'tokens_per_image')
+
+
+def levenshtein(source: Sequence, target: Sequence) -> int:
+    """Edit distance (insert/delete/substitute) antara dua string atau list token"""
+    try:
+        from rapidfuzz.distance import Levenshtein
+        return Levenshtein.distance(source, target)
+    except ImportError:
+        pass
+
+    if len(source) < len(target):
+        source, target = target, source
+    previous = list(range(len(target) + 1))
+    for i, item in enumerate(source, 1):
+        current = [i]
+        for j, other in enumerate(target, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (item != other)))
+        previous = current
+    return previous[-1]
+
+
+def error_counts(hypothesis: str, reference: str) -> Dict:
+    """
+    Jumlah error karakter dan kata (whitespace dinormalisasi)
+
+    Returns:
+        Dictionary dengan 'char_errors', 'chars', 'word_errors', 'words'
+    """
+    hypothesis_words = hypothesis.split()
+    reference_words = reference.split()
+    return {
+        'char_errors': levenshtein(' '.join(hypothesis_words), ' '.join(reference_words)),
+        'chars': len(' '.join(reference_words)),
+        'word_errors': levenshtein(hypothesis_words, reference_words),
+        'words': len(reference_words)
+    }
+
+
+def find_ground_truth(image_files: List[str]) -> List[Tuple[str, str]]:
+    """Pasangan (gambar, teks ground truth) untuk gambar yang punya <nama>.gt.txt"""
+    samples = []
+    for image_path in image_files:
+        gt_path = os.path.splitext(image_path)[0] + GROUND_TRUTH_SUFFIX
+        if os.path.exists(gt_path):
+            with open(gt_path, 'r', encoding='utf-8') as f:
+                samples.append((image_path, f.read()))
+    return samples
+
+
+def build_grid(psm_modes: Sequence[int], preprocess: Sequence[str], languages: Sequence[str],
+               gemini: Sequence[bool]) -> List[Dict]:
+    """Semua kombinasi setting sebagai list konfigurasi"""
+    return [
+        {
+            'name': f"psm{psm} {method} {language} {'gemini' if use_gemini else 'tesseract'}",
+            'psm_mode': psm, 'preprocess': method, 'language': language, 'gemini': use_gemini
+        }
+        for psm, method, language, use_gemini in itertools.product(psm_modes, preprocess, languages, gemini)
+    ]
+
+
+def mark_pareto(rows: List[Dict], keys: Sequence[str] = PARETO_KEYS):
+    """Set row['pareto'] = True untuk konfigurasi yang tidak didominasi konfigurasi lain"""
+    for row in rows:
+        row['pareto'] = not any(
+            all(other[key] <= row[key] for key in keys) and any(other[key] < row[key] for key in keys)
+            for other in rows if other is not row
+        )
+
+
+def run_sweep(samples: List[Tuple[str, str]], grid: List[Dict],
+              ocr: Callable[[str, Dict], str], correct: Optional[Callable[[str], Tuple[str, int]]] = None,
+              workers: int = 1, gemini_workers: int = 4) -> List[Dict]:
+    """
+    Jalankan grid pada semua sampel secara paralel
+
+    OCR dijalankan sekali per (gambar, psm, preprocessing, language) dan dipakai
+    bersama oleh konfigurasi Gemini on/off; koreksi Gemini juga sekali per teks OCR.
+
+    Args:
+        samples: Pasangan (gambar, ground truth) dari find_ground_truth()
+        grid: Konfigurasi dari build_grid()
+        ocr: Fungsi (gambar, konfigurasi) -> teks OCR
+        correct: Fungsi teks -> (teks terkoreksi, total token); wajib jika ada konfigurasi Gemini
+        workers: Jumlah OCR paralel
+        gemini_workers: Jumlah request Gemini paralel
+
+    Returns:
+        Satu row per konfigurasi: 'cer', 'wer', 'seconds_per_image',
+        'tokens_per_image', 'pareto' dan setting konfigurasinya, urut CER
+    """
+    def ocr_key(config: Dict) -> Tuple:
+        return (config['psm_mode'], config['preprocess'], config['language'])
+
+    def timed(function, *args):
+        start = time.perf_counter()
+        value = function(*args)
+        return value, time.perf_counter() - start
+
+    ocr_configs = {ocr_key(config): config for config in grid}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        ocr_futures = {
+            (image_path, key): executor.submit(timed, ocr, image_path, config)
+            for key, config in ocr_configs.items()
+            for image_path, _ in samples
+        }
+        ocr_results = {item: future.result() for item, future in ocr_futures.items()}
+
+    corrected = {}
+    gemini_keys = {ocr_key(config) for config in grid if config['gemini']}
+    if gemini_keys:
+        if correct is None:
+            raise ValueError("Konfigurasi Gemini membutuhkan fungsi koreksi (GEMINI_API_KEY)")
+        with ThreadPoolExecutor(max_workers=max(1, gemini_workers)) as executor:
+            correction_futures = {
+                item: executor.submit(timed, correct, text)
+                for item, (text, _) in ocr_results.items() if item[1] in gemini_keys
+            }
+            corrected = {item: future.result() for item, future in correction_futures.items()}
+
+    # Error dihitung sekali per (teks, ground truth) yang berbeda
+    error_cache = {}
+    rows = []
+    for config in grid:
+        totals = {'char_errors': 0, 'chars': 0, 'word_errors': 0, 'words': 0}
+        seconds = 0.0
+        tokens = 0
+        for image_path, reference in samples:
+            item = (image_path, ocr_key(config))
+            text, elapsed = ocr_results[item]
+            seconds += elapsed
+            if config['gemini']:
+                (text, used_tokens), elapsed = corrected[item]
+                seconds += elapsed
+                tokens += used_tokens
+
+            cache_key = (image_path, text)
+            if cache_key not in error_cache:
+                error_cache[cache_key] = error_counts(text, reference)
+            for key, value in error_cache[cache_key].items():
+                totals[key] += value
+
+        count = len(samples) or 1
+        row = dict(config)
+        row.update({
+            'images': len(samples),
+            'cer': totals['char_errors'] / totals['chars'] if totals['chars'] else 0.0,
+            'wer': totals['word_errors'] / totals['words'] if totals['words'] else 0.0,
+            'seconds_per_image': seconds / count,
+            'tokens_per_image': tokens / count
+        })
+        rows.append(row)
+
+    mark_pareto(rows)
+    rows.sort(key=lambda row: (row['cer'], row['seconds_per_image']))
+    return rows
+
+
+def save_sweep_csv(rows: List[Dict], output_file: Optional[str] = None) -> str:
+    """Simpan tabel sweep ke CSV"""
+    output_file = output_file or f"sweep_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    columns = ['name', 'psm_mode', 'preprocess', 'language', 'gemini', 'images',
+               'cer', 'wer', 'seconds_per_image', 'tokens_per_image', 'pareto']
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_file
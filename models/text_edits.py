@@ -0,0 +1,154 @@
+# models/text_edits.py
+"""
+Span-level text edits untuk koreksi diff-only
+Gemini hanya mengirim edit (offset/original/replacement), teks terkoreksi
+dibangun ulang secara lokal dari teks OCR mentah
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+# Token kata beserta whitespace setelahnya (atau whitespace di awal teks);
+# gabungan semua token = teks asli
+_TOKEN_PATTERN = re.compile(r'^\s+|\S+\s*')
+
+
+def _resolve_offset(text: str, original: str, offset: int) -> int:
+    """
+    Cari posisi `original` di `text` yang paling dekat dengan offset yang dilaporkan
+
+    Offset dari model bahasa sering meleset beberapa karakter, jadi offset hanya
+    dipakai sebagai petunjuk. Return -1 jika `original` tidak ditemukan.
+    """
+    if not original:
+        return offset if 0 <= offset <= len(text) else -1
+
+    if text.startswith(original, offset):
+        return offset
+
+    best = -1
+    start = text.find(original)
+    while start != -1:
+        if best == -1 or abs(start - offset) < abs(best - offset):
+            best = start
+        start = text.find(original, start + 1)
+    return best
+
+
+def apply_edits(text: str, edits: List[Dict]) -> Tuple[str, List[Dict]]:
+    """
+    Terapkan list edit ke teks
+
+    Args:
+        text: Teks asli
+        edits: List dict dengan 'offset', 'original', 'replacement' (dan opsional 'reason')
+
+    Returns:
+        Tuple (teks terkoreksi, list edit yang benar-benar diterapkan dengan offset
+        yang sudah divalidasi). Edit yang tidak cocok atau tumpang tindih dilewati.
+    """
+    resolved = []
+    for edit in edits:
+        original = str(edit.get('original', ''))
+        replacement = str(edit.get('replacement', ''))
+        if original == replacement:
+            continue
+
+        try:
+            offset = int(edit.get('offset', 0))
+        except (TypeError, ValueError):
+            offset = 0
+
+        position = _resolve_offset(text, original, offset)
+        if position == -1:
+            continue
+
+        resolved.append({
+            'offset': position,
+            'original': original,
+            'replacement': replacement,
+            'reason': edit.get('reason', '')
+        })
+
+    resolved.sort(key=lambda item: item['offset'])
+
+    parts = []
+    applied = []
+    cursor = 0
+    for edit in resolved:
+        if edit['offset'] < cursor:
+            # Tumpang tindih dengan edit sebelumnya
+            continue
+        parts.append(text[cursor:edit['offset']])
+        parts.append(edit['replacement'])
+        cursor = edit['offset'] + len(edit['original'])
+        applied.append(edit)
+    parts.append(text[cursor:])
+
+    return ''.join(parts), applied
+
+
+def _diff_tokens(original: str, corrected: str, base_offset: int) -> List[Dict]:
+    """Diff per token (kata beserta whitespace setelahnya) untuk potongan teks pendek"""
+    source = _TOKEN_PATTERN.findall(original)
+    target = _TOKEN_PATTERN.findall(corrected)
+
+    # Offset karakter awal setiap token di teks original
+    offsets = [base_offset]
+    for token in source:
+        offsets.append(offsets[-1] + len(token))
+
+    matcher = SequenceMatcher(None, source, target, autojunk=False)
+    return [
+        {
+            'offset': offsets[i1],
+            'original': ''.join(source[i1:i2]),
+            'replacement': ''.join(target[j1:j2]),
+            'reason': ''
+        }
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+
+
+def diff_edits(original: str, corrected: str) -> List[Dict]:
+    """
+    Hitung edit per span yang mengubah `original` menjadi `corrected`
+
+    Dipakai untuk mode koreksi 'full', supaya hasil bisa disimpan sebagai
+    teks mentah + edit, bukan dua salinan teks yang hampir identik.
+    Diff dilakukan per baris dulu, lalu per token hanya pada baris yang
+    berubah, supaya tetap cepat untuk teks panjang.
+    """
+    if original == corrected:
+        return []
+
+    source = original.splitlines(keepends=True)
+    target = corrected.splitlines(keepends=True)
+
+    # Offset karakter awal setiap baris di teks original
+    offsets = [0]
+    for line in source:
+        offsets.append(offsets[-1] + len(line))
+
+    edits = []
+    matcher = SequenceMatcher(None, source, target, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            # Baris berpasangan (kasus umum koreksi typo): diff token per baris
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                edits.extend(_diff_tokens(source[i], target[j], offsets[i]))
+        elif tag == 'replace':
+            edits.extend(_diff_tokens(''.join(source[i1:i2]), ''.join(target[j1:j2]), offsets[i1]))
+        else:
+            edits.append({
+                'offset': offsets[i1],
+                'original': ''.join(source[i1:i2]),
+                'replacement': ''.join(target[j1:j2]),
+                'reason': ''
+            })
+
+    return edits
@@ -0,0 +1,229 @@
+# models/tuning.py
+"""
+Auto-tuning jumlah proses Tesseract x thread OpenMP per proses
+Beberapa proses `tesseract` paralel yang masing-masing juga memakai thread
+OpenMP sendiri membuat CPU oversubscribed. Kalibrasi singkat memilih split
+terbaik untuk core dan memori host, lalu disimpan sebagai profil per host.
+"""
+
+import json
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import cycle, islice
+from typing import Dict, List, Optional
+
+DEFAULT_TUNING_FILE = "ocr_tuning.json"
+
+# Perkiraan memori satu proses tesseract (ind+eng, LSTM) untuk membatasi jumlah proses
+TESSERACT_MEMORY_MB = 250
+
+# Thread OpenMP Tesseract jarang menambah throughput di atas 4 thread
+MAX_THREADS_PER_PROCESS = 4
+
+
+def tuning_file() -> str:
+    """Path file profil tuning (OCR_TUNING_FILE, bisa di shared volume)"""
+    return os.getenv('OCR_TUNING_FILE', DEFAULT_TUNING_FILE)
+
+
+def host_resources() -> Dict:
+    """Jumlah core yang boleh dipakai proses ini dan total memori (MB, None jika tidak diketahui)"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+
+    try:
+        memory_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        memory_mb = None
+
+    return {'host': socket.gethostname(), 'cores': max(1, cores), 'memory_mb': memory_mb}
+
+
+def max_processes(resources: Dict) -> int:
+    """Batas jumlah proses tesseract berdasarkan core dan memori"""
+    limit = resources['cores']
+    if resources['memory_mb']:
+        # Sisakan separuh memori untuk sistem dan proses lain
+        limit = min(limit, max(1, resources['memory_mb'] // 2 // TESSERACT_MEMORY_MB))
+    return max(1, limit)
+
+
+def candidate_splits(resources: Dict) -> List[Dict]:
+    """
+    Kombinasi (processes, threads_per_process) yang dicoba saat kalibrasi
+
+    Jumlah proses berupa kelipatan 2 sampai batas core/memori, dengan thread
+    per proses mengisi sisa core (processes x threads <= cores).
+    """
+    cores = resources['cores']
+    limit = max_processes(resources)
+
+    counts = []
+    processes = 1
+    while processes < limit:
+        counts.append(processes)
+        processes *= 2
+    counts.append(limit)
+
+    return [
+        {'processes': count, 'threads_per_process': max(1, min(MAX_THREADS_PER_PROCESS, cores // count))}
+        for count in counts
+    ]
+
+
+def _load_all(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_profile(path: Optional[str] = None) -> Optional[Dict]:
+    """
+    Profil tuning untuk host ini
+
+    Returns:
+        Dictionary profil, atau None jika belum ada atau jumlah core host
+        sudah berubah sejak kalibrasi (mis. container di-resize)
+    """
+    resources = host_resources()
+    profile = _load_all(path or tuning_file()).get(resources['host'])
+    if not profile or profile.get('cores') != resources['cores']:
+        return None
+    return profile
+
+
+def save_profile(profile: Dict, path: Optional[str] = None) -> str:
+    """Simpan profil untuk host ini (profil host lain di file yang sama dipertahankan)"""
+    path = path or tuning_file()
+    data = _load_all(path)
+    data[profile['host']] = profile
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+    resolve_worker_config.cache_clear()
+    return path
+
+
+@lru_cache(maxsize=1)
+def resolve_worker_config() -> Dict:
+    """
+    Konfigurasi worker default (dihitung sekali per proses)
+
+    Urutan: environment (OCR_TESSERACT_CONCURRENCY, OMP_THREAD_LIMIT), profil
+    tuning host ini, lalu heuristik satu thread per proses dengan jumlah proses
+    sebanyak core (dibatasi memori).
+
+    Returns:
+        Dictionary dengan 'processes', 'threads_per_process' dan 'source'.
+        Hasil di-cache, jadi jangan dimodifikasi oleh caller.
+    """
+    resources = host_resources()
+    profile = load_profile()
+
+    if profile:
+        processes = profile['processes']
+        threads = profile['threads_per_process']
+        source = 'profile'
+    else:
+        processes = max_processes(resources)
+        threads = max(1, resources['cores'] // processes)
+        source = 'default'
+
+    if os.getenv('OCR_TESSERACT_CONCURRENCY'):
+        processes = int(os.getenv('OCR_TESSERACT_CONCURRENCY'))
+        source = 'env'
+    if os.getenv('OMP_THREAD_LIMIT'):
+        threads = int(os.getenv('OMP_THREAD_LIMIT'))
+        source = 'env'
+
+    return {'processes': max(1, processes), 'threads_per_process': max(1, threads), 'source': source}
+
+
+def calibrate(image_files: List[str], psm_mode: int = 6, jobs: Optional[int] = None,
+              splits: Optional[List[Dict]] = None, progress=None) -> Dict:
+    """
+    Ukur throughput Tesseract untuk setiap split dan pilih yang terbaik
+
+    Args:
+        image_files: Gambar contoh (diulang sampai jumlah job terpenuhi)
+        psm_mode: PSM mode yang dipakai saat kalibrasi
+        jobs: Jumlah gambar per split (default: max(jumlah gambar, 2x core))
+        splits: Kombinasi yang dicoba (default: candidate_splits())
+        progress: Optional callback(split_result) setelah setiap split diukur
+
+    Returns:
+        Profil: 'processes', 'threads_per_process', 'images_per_second',
+        'results' (semua split), plus info host
+
+    Raises:
+        ValueError: Jika tidak ada gambar contoh atau semua split gagal
+    """
+    from models.ocr_model import probe_tesseract, run_tesseract
+
+    if not image_files:
+        raise ValueError("Kalibrasi membutuhkan minimal satu gambar contoh")
+
+    resources = host_resources()
+    splits = splits or candidate_splits(resources)
+    jobs = jobs or max(len(image_files), resources['cores'] * 2)
+    workload = list(islice(cycle(image_files), jobs))
+
+    # Warm-up: traineddata dan gambar masuk page cache sebelum pengukuran. Gambar
+    # yang memang tanpa teks di sini menjadi baseline hasil kosong per split
+    empty_images = {
+        path for path in dict.fromkeys(image_files)
+        if not run_tesseract(path, psm_mode, thread_limit=1)
+    }
+    baseline_empty = sum(1 for path in workload if path in empty_images)
+
+    results = []
+    for split in splits:
+        threads = split['threads_per_process']
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=split['processes']) as executor:
+            texts = list(executor.map(
+                lambda path: run_tesseract(path, psm_mode, thread_limit=threads), workload
+            ))
+        elapsed = time.perf_counter() - start
+
+        result = dict(split)
+        result['seconds'] = elapsed
+        result['images_per_second'] = len(workload) / elapsed if elapsed > 0 else 0.0
+        result['empty'] = sum(1 for text in texts if not text)
+        # Split yang membuat tesseract gagal (OOM/killed) mengembalikan "" dengan cepat
+        result['valid'] = result['empty'] <= baseline_empty
+        results.append(result)
+        if progress:
+            progress(result)
+
+    valid = [item for item in results if item['valid']]
+    if not valid:
+        raise ValueError("Semua split gagal (hasil kosong melebihi warm-up), profil tidak disimpan")
+    best = max(valid, key=lambda item: item['images_per_second'])
+    profile = dict(resources)
+    profile.update({
+        'processes': best['processes'],
+        'threads_per_process': best['threads_per_process'],
+        'images_per_second': best['images_per_second'],
+        'psm_mode': psm_mode,
+        'jobs': len(workload),
+        'tesseract_version': probe_tesseract()['version'],
+        'calibrated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results
+    })
+    return profile
@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""Root repo di sys.path supaya `models.*` bisa di-import saat menjalankan `pytest` dari mana pun"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
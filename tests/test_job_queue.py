@@ -0,0 +1,77 @@
+# tests/test_job_queue.py
+"""SQLiteJobQueue: lease kadaluarsa, ownership dan max_attempts"""
+
+import time
+
+import pytest
+
+from models.job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    def make(lease_seconds=60.0, max_attempts=3):
+        return SQLiteJobQueue(str(tmp_path / 'jobs.db'), lease_seconds=lease_seconds,
+                              max_attempts=max_attempts)
+    return make
+
+
+def test_claim_complete(make_queue):
+    queue = make_queue()
+    queue.enqueue(['a.jpg', 'b.jpg'], psm_mode=4)
+
+    job = queue.claim('w1')
+    assert job == {'id': 1, 'image_path': 'a.jpg', 'psm_mode': 4, 'attempts': 1}
+    assert queue.complete(job['id'], 'w1')
+    assert not queue.complete(job['id'], 'w1')
+    assert queue.stats() == {'pending': 1, 'leased': 0, 'done': 1, 'failed': 0}
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_rejected(make_queue):
+    queue = make_queue(lease_seconds=0.05)
+    queue.enqueue(['a.jpg'])
+
+    first = queue.claim('w1')
+    assert queue.claim('w2') is None
+    time.sleep(0.1)
+
+    second = queue.claim('w2')
+    assert second['id'] == first['id']
+    assert second['attempts'] == 2
+    assert not queue.heartbeat(first['id'], 'w1')
+    assert not queue.complete(first['id'], 'w1')
+    assert not queue.fail(first['id'], 'w1', 'terlambat')
+    assert queue.complete(second['id'], 'w2')
+
+
+def test_heartbeat_keeps_lease(make_queue):
+    queue = make_queue(lease_seconds=0.2)
+    queue.enqueue(['a.jpg'])
+
+    job = queue.claim('w1')
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.heartbeat(job['id'], 'w1')
+    assert queue.claim('w2') is None
+
+
+def test_fail_requeues_until_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    queue.enqueue(['a.jpg'])
+
+    assert queue.fail(queue.claim('w1')['id'], 'w1', 'error 1')
+    assert queue.stats()['pending'] == 1
+    assert queue.fail(queue.claim('w1')['id'], 'w1', 'error 2')
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}
+    assert queue.claim('w1') is None
+
+
+def test_expired_lease_at_max_attempts_is_failed(make_queue):
+    queue = make_queue(lease_seconds=0.05, max_attempts=1)
+    queue.enqueue(['crash.jpg'])
+
+    assert queue.claim('w1') is not None
+    time.sleep(0.1)
+    # Worker crash berulang: job tidak di-claim lagi
+    assert queue.claim('w2') is None
+    assert queue.stats()['failed'] == 1
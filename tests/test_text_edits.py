@@ -0,0 +1,58 @@
+# tests/test_text_edits.py
+"""apply_edits / diff_edits: round-trip dan offset yang meleset"""
+
+import pytest
+
+from models.text_edits import apply_edits, diff_edits
+
+
+@pytest.mark.parametrize('raw, corrected', [
+    ("Ini adalah dokumen pengujain", "Ini adalah dokumen pengujian"),
+    ("baris satu\nbaris dua typo\nbaris tiga\n", "baris satu\nbaris dua\nbaris tiga\n"),
+    ("teh quick brown", "the quick  brown fox"),
+    ("a\nb\nc", "a\nx\ny\nz\nc"),
+    ("  spasi di awal", "spasi di awal"),
+    ("", "teks baru"),
+])
+def test_diff_then_apply_round_trip(raw, corrected):
+    edits = diff_edits(raw, corrected)
+    text, applied = apply_edits(raw, edits)
+    assert text == corrected
+    assert len(applied) == len(edits)
+
+
+def test_identical_text_has_no_edits():
+    assert diff_edits("sama persis", "sama persis") == []
+
+
+def test_drifted_offset_resolves_to_nearest_occurrence():
+    raw = "kata salah di sini, lalu kata salah lagi"
+    # Offset dilaporkan meleset 3 karakter dari kemunculan kedua (index 25)
+    edits = [{'offset': 28, 'original': 'kata salah', 'replacement': 'kata benar'}]
+    text, applied = apply_edits(raw, edits)
+    assert text == "kata salah di sini, lalu kata benar lagi"
+    assert applied[0]['offset'] == raw.rindex('kata salah')
+
+
+def test_unmatched_edits_are_skipped():
+    raw = "satu dua tiga"
+    edits = [
+        {'offset': 0, 'original': 'tidak ada', 'replacement': 'x'},
+        {'offset': 5, 'original': 'dua', 'replacement': '2'},
+        {'offset': 'bukan angka', 'original': 'tiga', 'replacement': '3'},
+    ]
+    text, applied = apply_edits(raw, edits)
+    assert text == "satu 2 3"
+    assert [edit['original'] for edit in applied] == ['dua', 'tiga']
+
+
+def test_overlapping_edit_is_skipped():
+    raw = "satu dua tiga"
+    # Edit yang mulai lebih awal menang; edit yang tumpang tindih dengannya dilewati
+    edits = [
+        {'offset': 5, 'original': 'dua', 'replacement': '2'},
+        {'offset': 4, 'original': ' dua', 'replacement': ' DUA'},
+    ]
+    text, applied = apply_edits(raw, edits)
+    assert text == "satu DUA tiga"
+    assert len(applied) == 1
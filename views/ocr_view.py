@@ -180,6 +180,8 @@ class OCRView:
         print(f"\n📈 Informasi:")
         print(f"   Gambar: {result['image_name']}")
         print(f"   PSM Mode: {result['psm_mode']} ({result.get('psm_description', 'N/A')})")
+        if result.get('language'):
+            print(f"   Bahasa OCR: {result['language']}")
         print(f"   Metode: {result['method']}")
         print(f"   Confidence: {result['confidence']}/10")
         
@@ -190,6 +192,11 @@ class OCRView:
         print(f"   Kata final: {stats['final_words']}")
         print(f"   Koreksi dilakukan: {stats['corrections_count']}")
         
+        usage = result.get('usage')
+        if usage:
+            print(f"   Token Gemini: prompt {usage['prompt_tokens']} | output {usage['output_tokens']} | "
+                  f"cached {usage['cached_tokens']} ({usage['prompt_template']}, {usage['latency_ms']:.0f} ms)")
+        
         # Show warning if present
         if 'warning' in result:
             print(f"   ⚠️ Warning: {result['warning']}")
@@ -208,6 +215,14 @@ class OCRView:
         print(f"\n🤖 Teks Terkoreksi (Gemini):")
         print("-" * 40)
         print(result['final_text'] if result['final_text'] else "(Tidak ada teks terdeteksi)")
+        
+        fields = result.get('fields')
+        if fields:
+            print(f"\n🗂️ Field Form ({result.get('form_template', 'N/A')}):")
+            print("-" * 40)
+            width = max(len(name) for name in fields)
+            for name, value in fields.items():
+                print(f"   {name:<{width}} : {value}")
     
     def show_save_confirmation(self, output_file: str):
         """Show save confirmation"""
@@ -241,6 +256,69 @@ class OCRView:
         print(f"\n🏆 Rekomendasi: PSM {results['recommended_psm']} (Quality: {results['best_quality_score']:.1f})")
         print(f"📝 Kata terbanyak: PSM {results['most_words_psm']}")
     
+    def show_usage_summary(self, totals: Dict):
+        """Show akumulasi token dan latency Gemini untuk satu batch"""
+        if not totals['calls']:
+            return
+        calls = totals['calls']
+        print(f"\n🪙 Token Gemini ({calls} call):")
+        print(f"   Prompt: {totals['prompt_tokens']} (avg {totals['prompt_tokens'] / calls:.0f}) | "
+              f"Output: {totals['output_tokens']} (avg {totals['output_tokens'] / calls:.0f}) | "
+              f"Cached: {totals['cached_tokens']}")
+        print(f"   Latency avg: {totals['latency_ms'] / calls:.0f} ms | Template: "
+              + ", ".join(f"{name} x{count}" for name, count in totals['templates'].items()))
+    
+    def show_scheduler_stats(self, stats: Dict):
+        """Show queue depth dan wait time per resource per priority class"""
+        print(f"\n⏳ Scheduler:")
+        for resource, classes in stats.items():
+            for name, data in classes.items():
+                if not data['acquired'] and not data['queue_depth']:
+                    continue
+                print(f"   {resource:<10} {name:<12} antri {data['queue_depth']:3d} | "
+                      f"aktif {data['in_flight']:2d} | wait avg {data['avg_wait_ms']:7.1f} ms "
+                      f"max {data['max_wait_ms']:7.1f} ms")
+    
+    def show_profile_summary(self, summary: Dict):
+        """Show ringkasan profiling per stage dan lokasi file output"""
+        print(f"\n🔬 PROFILE PIPELINE")
+        print("=" * 60)
+        print(f"   {'Stage':<26} {'Calls':>5} {'Wall':>9} {'Py CPU':>9} {'Subproc':>9}")
+        for name, data in summary['stages'].items():
+            print(f"   {name:<26} {data['calls']:>5} {data['wall_s']:>8.3f}s "
+                  f"{data['python_cpu_s']:>8.3f}s {data['subprocess_wall_s']:>8.3f}s")
+        print(f"\n📂 File profile disimpan di: {summary['output_dir']}")
+        for path in summary['files']:
+            print(f"   - {os.path.basename(path)}")
+    
+    def show_tuning_step(self, result: Dict):
+        """Show throughput satu split proses x thread selama kalibrasi"""
+        status = "" if result.get('valid', True) else f" ⚠️ gagal: {result['empty']} hasil kosong"
+        print(f"   {result['processes']:>3} proses x {result['threads_per_process']} thread: "
+              f"{result['images_per_second']:6.2f} gambar/detik ({result['seconds']:.1f}s){status}")
+
+    def show_tuning_profile(self, profile: Dict, path: str):
+        """Show profil tuning yang terpilih"""
+        memory = f"{profile['memory_mb']} MB" if profile.get('memory_mb') else "N/A"
+        print(f"\n🎛️ PROFIL WORKER ({profile['host']}: {profile['cores']} core, memori {memory})")
+        print("=" * 60)
+        print(f"   Proses Tesseract paralel : {profile['processes']}")
+        print(f"   OMP_THREAD_LIMIT          : {profile['threads_per_process']}")
+        print(f"   Throughput                : {profile['images_per_second']:.2f} gambar/detik")
+        print(f"\n📂 Profil disimpan di: {path}")
+
+    def show_sweep_table(self, rows: List[Dict], output_file: str):
+        """Show tabel sweep (urut CER), ★ menandai konfigurasi di Pareto front"""
+        print(f"\n🧪 SWEEP AKURASI vs KECEPATAN ({rows[0]['images'] if rows else 0} gambar)")
+        print("=" * 80)
+        print(f"   {'':2}{'Konfigurasi':<36} {'CER':>7} {'WER':>7} {'Detik/img':>10} {'Token/img':>10}")
+        for row in rows:
+            marker = "★" if row['pareto'] else ""
+            print(f"   {marker:<2}{row['name']:<36} {row['cer']:>6.1%} {row['wer']:>6.1%} "
+                  f"{row['seconds_per_image']:>10.2f} {row['tokens_per_image']:>10.0f}")
+        print(f"\n★ = Pareto front (tidak ada konfigurasi lain yang lebih akurat sekaligus lebih cepat/murah)")
+        print(f"📂 Tabel disimpan di: {output_file}")
+
     def _get_file_size(self, file_path: str) -> str:
         """Get formatted file size"""
         try: